@@ -0,0 +1,88 @@
+"""
+JWT authentication exposing verified token claims to views
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .revocation import revocation_list
+
+# custom claims added to the token by MyTokenObtainPairSerializer
+CLAIMS = ("username", "role")
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    Verify the bearer token once per request and attach its claims as `request.claims`
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+
+        if revocation_list.is_revoked(validated_token[api_settings.JTI_CLAIM]):
+            raise InvalidToken("Token has been revoked")
+
+        return validated_token
+
+    def authenticate(self, request):
+        authenticated = super().authenticate(request)
+        if authenticated is None:
+            return None
+
+        user, validated_token = authenticated
+        request.claims = {claim: validated_token.get(claim) for claim in CLAIMS}
+        return user, validated_token
+
+
+class TokenClaimsMixin:
+    """
+    Mixin for protected views - validate request parameters against the token claims
+    """
+
+    def validate_user(self, request, username) -> None:
+        if username != request.claims.get("username"):
+            raise ValidationError({"Error": "Bearer token does not match username"})
+
+
+def user_is_active(user_id) -> bool:
+    """
+    Return whether the user may still authenticate, caching the answer for a short time
+    """
+    key = active_user_cache_key(user_id)
+    is_active = cache.get(key)
+
+    if is_active is None:
+        is_active = User.objects.filter(pk=user_id, is_active=True).exists()
+        cache.set(key, is_active, settings.STATELESS_AUTH_USER_CACHE_TIMEOUT)
+
+    return is_active
+
+
+def active_user_cache_key(user_id) -> str:
+    return f"auth:user-active:{user_id}"
+
+
+class StatelessClaimsJWTAuthentication(ClaimsJWTAuthentication):
+    """
+    Opt-in authentication for read-only views - build `request.user` from the verified
+    token claims instead of loading the User row on every request.
+
+    Disabled accounts are still rejected through `user_is_active`, which hits the
+    database at most once per user every STATELESS_AUTH_USER_CACHE_TIMEOUT seconds.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        if not user_is_active(user_id):
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+
+        return api_settings.TOKEN_USER_CLASS(validated_token)
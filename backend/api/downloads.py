@@ -0,0 +1,192 @@
+"""
+Stream stored files to the client
+
+Attachments are sent with a `FileResponse`, which reads the file in chunks of
+DOWNLOAD_CHUNK_SIZE bytes while the response is written and closes it afterwards, so
+the memory used by a download does not depend on the size of the file.
+
+Single byte ranges (`Range: bytes=start-end`) are answered with 206 Partial Content so
+interrupted downloads can resume and video players can seek. `If-Range` is checked
+against the strong ETag stored with the file. Requests for several ranges are
+rejected with 416 rather than answered with a multipart body.
+
+With DOWNLOAD_OFFLOAD set, Django only authorizes the download and hands the file to
+the front web server through an internal redirect header (`X-Accel-Redirect` for nginx,
+`X-Sendfile` for Apache / lighttpd). The web server then sends the file, including
+range requests, with sendfile and no Python worker is kept busy.
+"""
+
+import hashlib
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.storage import default_storage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+# bytes=start-end, bytes=start- or bytes=-suffix_length
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# DOWNLOAD_OFFLOAD modes
+X_ACCEL_REDIRECT = "x-accel-redirect"
+X_SENDFILE = "x-sendfile"
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def file_etag(file) -> str:
+    """
+    Return a strong ETag (quoted sha256) of the content of `file`
+    """
+    digest = hashlib.sha256()
+    for chunk in file.chunks(settings.DOWNLOAD_CHUNK_SIZE):
+        digest.update(chunk)
+
+    # a FieldFile opened from storage for hashing - release the handle
+    if getattr(file, "_committed", False):
+        file.close()
+
+    return f'"{digest.hexdigest()}"'
+
+
+def requested_range(request, size: int, etag=None):
+    """
+    Return the (first, last) byte positions requested by the Range header, or None to
+    send the whole file
+    """
+    range_header = request.headers.get("Range")
+    if not range_header:
+        return None
+
+    # If-Range: only send the range if the client's copy is still current. Dates are
+    # not tracked, so they never match
+    if_range = request.headers.get("If-Range")
+    if if_range is not None and (not etag or if_range.strip() != etag):
+        return None
+
+    ranges = range_header.replace(" ", "")
+    if "," in ranges:
+        raise RangeNotSatisfiable("Multiple ranges are not supported")
+
+    match = RANGE_RE.match(ranges)
+    if match is None or match.groups() == ("", ""):
+        # invalid or other unit - ignored as allowed by RFC 9110
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable("Empty suffix range")
+        return max(size - length, 0), size - 1
+
+    first = int(first)
+    last = size - 1 if last == "" else min(int(last), size - 1)
+    if last < first:
+        if first < size:
+            # last-pos before first-pos: invalid syntax, ignored
+            return None
+        raise RangeNotSatisfiable("Range starts after the end of the file")
+
+    return first, last
+
+
+def read_range(file, first: int, last: int):
+    """
+    Yield bytes `first` to `last` of `file` in chunks, closing it at the end
+    """
+    try:
+        file.seek(first)
+        remaining = last - first + 1
+        while remaining > 0:
+            chunk = file.read(min(settings.DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        file.close()
+
+
+def offload_response(name: str, storage, etag=None) -> HttpResponse:
+    """
+    Return an empty response telling the web server to send the file `name`
+    """
+    filename = os.path.basename(name)
+    response = HttpResponse(
+        content_type=mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    )
+
+    if settings.DOWNLOAD_OFFLOAD == X_ACCEL_REDIRECT:
+        # nginx: internal location aliasing MEDIA_ROOT, eg:
+        #   location /protected/media/ { internal; alias /path/to/media/; }
+        redirect = settings.DOWNLOAD_OFFLOAD_PREFIX + quote(name)
+        response.headers["X-Accel-Redirect"] = redirect
+    elif settings.DOWNLOAD_OFFLOAD == X_SENDFILE:
+        response.headers["X-Sendfile"] = storage.path(name)
+    else:
+        raise ImproperlyConfigured(
+            f"DOWNLOAD_OFFLOAD must be None, {X_ACCEL_REDIRECT!r} or {X_SENDFILE!r}"
+        )
+
+    # the web server sets Content-Length and answers Range requests from the file
+    response.headers["Content-Disposition"] = content_disposition_header(True, filename)
+    if etag:
+        response.headers["ETag"] = etag
+
+    return response
+
+
+def file_response(request, name: str, storage=None, etag=None) -> HttpResponse:
+    """
+    Return a streaming attachment response for the file `name` of `storage`
+
+    Content-Type is guessed from the file name, Content-Length is the size of the
+    (part of the) file sent and Content-Disposition names the downloaded file after it.
+    """
+    storage = storage or default_storage
+    if settings.DOWNLOAD_OFFLOAD:
+        return offload_response(name, storage, etag)
+
+    filename = os.path.basename(name)
+    file = storage.open(name, "rb")
+
+    try:
+        byte_range = requested_range(request, file.size, etag)
+    except RangeNotSatisfiable:
+        size = file.size
+        file.close()
+        response = HttpResponse(status=416)
+        response.headers["Content-Range"] = f"bytes */{size}"
+        response.headers["Accept-Ranges"] = "bytes"
+        return response
+
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=True, filename=filename)
+        response.block_size = settings.DOWNLOAD_CHUNK_SIZE
+    else:
+        first, last = byte_range
+        response = StreamingHttpResponse(
+            read_range(file, first, last),
+            status=206,
+            content_type=mimetypes.guess_type(filename)[0]
+            or "application/octet-stream",
+        )
+        response.headers["Content-Range"] = f"bytes {first}-{last}/{file.size}"
+        response.headers["Content-Length"] = str(last - first + 1)
+        response.headers["Content-Disposition"] = content_disposition_header(
+            True, filename
+        )
+
+    response.headers["Accept-Ranges"] = "bytes"
+    if etag:
+        response.headers["ETag"] = etag
+
+    return response
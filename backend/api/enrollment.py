@@ -0,0 +1,108 @@
+"""
+Bulk enrollment - enroll or moderate many learners of a course in one call
+
+Users are resolved with one `IN` query and existing enrollments with another, then
+the missing `CourseTracker` rows are inserted with batched `bulk_create`.
+Blocking/unblocking a set of learners is a single `UPDATE ... RETURNING` statement.
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+
+from .models import Course, CourseTracker
+
+ENROLLED = "enrolled"
+ALREADY_ENROLLED = "already_enrolled"
+NOT_FOUND = "not_found"
+
+
+def enroll_users(course: Course, usernames: list, batch_size=None) -> dict:
+    """
+    Enroll `usernames` into `course`, returning a per-user result summary
+
+    Each username gets one of the statuses: enrolled, already_enrolled (the user is a
+    learner or the author of the course), not_found.
+    """
+    batch_size = batch_size or settings.ENROLLMENT_BATCH_SIZE
+
+    # keep the first occurrence of repeated usernames
+    usernames = list(dict.fromkeys(usernames))
+
+    user_ids = dict(
+        User.objects.filter(username__in=usernames).values_list("username", "id")
+    )
+
+    with transaction.atomic():
+        enrolled_user_ids = set(
+            CourseTracker.objects.filter(
+                course=course, user_id__in=user_ids.values()
+            ).values_list("user_id", flat=True)
+        )
+
+        results = []
+        trackers = []
+        for username in usernames:
+            user_id = user_ids.get(username)
+
+            if user_id is None:
+                result = NOT_FOUND
+            elif user_id in enrolled_user_ids:
+                result = ALREADY_ENROLLED
+            else:
+                result = ENROLLED
+                trackers.append(
+                    CourseTracker(
+                        user_id=user_id,
+                        course=course,
+                        is_blocked=False,
+                        profile=CourseTracker.LEARNER,
+                    )
+                )
+
+            results.append({"username": username, "status": result})
+
+        CourseTracker.objects.bulk_create(trackers, batch_size=batch_size)
+
+    return {"courseId": course.id, "enrolled": len(trackers), "results": results}
+
+
+def set_learners_blocked(
+    course: Course, is_blocked: bool, student_ids=None, enrolled_after=None
+) -> list:
+    """
+    Block or unblock the learners of `course` selected by `student_ids` and/or
+    `enrolled_after`, returning the learners whose status changed
+    """
+    learners = CourseTracker.objects.filter(
+        course=course, profile=CourseTracker.LEARNER
+    ).exclude(is_blocked=is_blocked)
+
+    if student_ids is not None:
+        learners = learners.filter(user_id__in=student_ids)
+    if enrolled_after is not None:
+        learners = learners.filter(created_at__gt=enrolled_after)
+
+    # one UPDATE ... WHERE id IN (SELECT ...) RETURNING statement, so the learners
+    # returned are exactly the rows it updated (SQLite >= 3.35, PostgreSQL)
+    quote_name = connection.ops.quote_name
+    tracker_table = quote_name(CourseTracker._meta.db_table)
+    user_table = quote_name(User._meta.db_table)
+    selected_sql, params = learners.values("pk").query.sql_with_params()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {tracker_table} SET {quote_name('is_blocked')} = %s "
+            f"WHERE {quote_name('id')} IN ({selected_sql}) "
+            f"RETURNING {quote_name('user_id')}, {quote_name('created_at')}, "
+            f"(SELECT {quote_name('username')} FROM {user_table} "
+            f"WHERE {user_table}.{quote_name('id')} = "
+            f"{tracker_table}.{quote_name('user_id')})",
+            [is_blocked, *params],
+        )
+        affected = sorted(cursor.fetchall(), key=lambda row: row[1])
+
+    return [
+        {"id": user_id, "username": username, "isBlocked": is_blocked}
+        for user_id, _, username in affected
+    ]
@@ -0,0 +1,47 @@
+"""
+HTTP caching helpers for public, anonymous GET endpoints
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def compute_etag(data) -> str:
+    """
+    Build a strong ETag from the JSON representation of a response payload
+    """
+    payload = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+    return quote_etag(hashlib.md5(payload.encode()).hexdigest())
+
+
+def cacheable_response(request, data, max_age=None):
+    """
+    Return `data` with Cache-Control, ETag and Vary headers set.
+
+    Returns 304 NOT MODIFIED when the request's If-None-Match matches the payload's ETag.
+    """
+    if max_age is None:
+        max_age = settings.PUBLIC_CACHE_MAX_AGE
+
+    etag = compute_etag(data)
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = Response(data, status=status.HTTP_200_OK)
+
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=max_age)
+    patch_vary_headers(response, ("Accept", "Accept-Encoding"))
+
+    return response
@@ -0,0 +1,55 @@
+"""
+Time-ordered identifiers
+"""
+
+import os
+import threading
+import time
+from uuid import UUID
+
+_lock = threading.Lock()
+_last_timestamp_ms = 0
+_last_counter = 0
+
+# rand_a holds a 12 bit counter. A new millisecond seeds it below 2**11 so
+# ids generated within that millisecond have room to keep increasing.
+_COUNTER_BITS = 12
+_COUNTER_SEED_MAX = 1 << (_COUNTER_BITS - 1)
+_COUNTER_MAX = (1 << _COUNTER_BITS) - 1
+
+
+def uuid7() -> UUID:
+    """
+    Return a version 7 UUID (RFC 9562) - 48 bit unix timestamp in ms, counter, random bits.
+
+    Ids generated by a process are strictly increasing, so they sort by creation time,
+    keep B-tree inserts append-mostly and can be used as pagination cursors.
+    """
+    global _last_timestamp_ms, _last_counter
+
+    with _lock:
+        timestamp_ms = time.time_ns() // 1_000_000
+
+        if timestamp_ms > _last_timestamp_ms:
+            counter = int.from_bytes(os.urandom(2), "big") % _COUNTER_SEED_MAX
+        else:
+            # same millisecond (or clock moved backwards) - keep increasing
+            timestamp_ms = _last_timestamp_ms
+            counter = _last_counter + 1
+            if counter > _COUNTER_MAX:
+                timestamp_ms += 1
+                counter = int.from_bytes(os.urandom(2), "big") % _COUNTER_SEED_MAX
+
+        _last_timestamp_ms = timestamp_ms
+        _last_counter = counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return UUID(int=value)
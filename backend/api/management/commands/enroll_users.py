@@ -0,0 +1,44 @@
+from typing import Any
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from ...enrollment import enroll_users
+from ...models import Course
+
+
+class Command(BaseCommand):
+    help = "Enroll users into a course as learners"
+
+    def add_arguments(self, parser):
+        parser.add_argument("course_id", help="Id of the course")
+        parser.add_argument("usernames", nargs="*", help="Usernames to enroll")
+        parser.add_argument(
+            "--file", help="Text file with one username per line to enroll"
+        )
+        parser.add_argument(
+            "--batch-size", type=int, help="Number of enrollments inserted per query"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        usernames = list(options["usernames"])
+
+        if options["file"]:
+            try:
+                with open(options["file"]) as file:
+                    usernames.extend(line.strip() for line in file if line.strip())
+            except OSError as e:
+                raise CommandError(e)
+
+        if not usernames:
+            raise CommandError("Provide usernames or --file")
+
+        try:
+            course = Course.objects.get(id=options["course_id"])
+        except (Course.DoesNotExist, ValidationError):
+            raise CommandError(f"Course {options['course_id']} does not exist")
+
+        summary = enroll_users(course, usernames, batch_size=options["batch_size"])
+
+        for result in summary["results"]:
+            if result["status"] != "enrolled":
+                self.stderr.write(f"{result['username']}: {result['status']}")
+        self.stdout.write(f"Enrolled {summary['enrolled']} users into {course.name}")
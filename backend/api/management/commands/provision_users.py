@@ -0,0 +1,47 @@
+from typing import Any
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from ...provisioning import FORMATS, guess_format, provision_users, read_records
+
+
+class Command(BaseCommand):
+    help = "Register users from a CSV or JSONL file (see api/provisioning.py)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file, one user per record")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format. Guessed from the file extension if absent",
+        )
+        parser.add_argument(
+            "--workers", type=int, help="Number of password hashing processes"
+        )
+        parser.add_argument(
+            "--chunk-size", type=int, help="Number of users inserted per transaction"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        path = options["path"]
+
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as file:
+                records = read_records(file, options["format"] or guess_format(path))
+        except OSError as e:
+            raise CommandError(e)
+        except serializers.ValidationError as e:
+            raise CommandError(e.args[0])
+        except UnicodeDecodeError:
+            raise CommandError(f"{path} must be UTF-8 encoded.")
+
+        report = provision_users(
+            records, chunk_size=options["chunk_size"], workers=options["workers"]
+        )
+
+        for error in report["errors"]:
+            self.stderr.write(
+                f"Row {error['row']} ({error['username']}): {error['errors']}"
+            )
+        self.stdout.write(
+            f"Created {len(report['created'])} users, {len(report['errors'])} rows failed"
+        )
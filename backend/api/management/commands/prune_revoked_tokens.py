@@ -0,0 +1,14 @@
+from datetime import datetime, timezone
+from typing import Any
+from django.core.management.base import BaseCommand
+from ...models import RevokedToken
+
+
+class Command(BaseCommand):
+    help = "Delete revoked tokens that have expired"
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        deleted, _ = RevokedToken.objects.filter(
+            expires_at__lte=datetime.now(timezone.utc)
+        ).delete()
+        self.stdout.write(f"Deleted {deleted} expired revoked tokens")
@@ -0,0 +1,23 @@
+from datetime import timedelta
+from typing import Any
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from ...models import UploadSession
+from ...uploads import discard_session
+
+
+class Command(BaseCommand):
+    help = "Delete chunked uploads left unfinished and their parts"
+
+    def handle(self, *args: Any, **options: Any) -> str | None:
+        created_before = timezone.now() - timedelta(
+            seconds=settings.CHUNKED_UPLOAD_SESSION_MAX_AGE
+        )
+        sessions = UploadSession.objects.filter(created_at__lt=created_before)
+
+        deleted = 0
+        for session in sessions.only("id"):
+            discard_session(session)
+            deleted += 1
+        self.stdout.write(f"Deleted {deleted} unfinished upload sessions")
@@ -12,7 +12,6 @@ from django.contrib.auth.models import User
 
 from typing import Any
 from django.core.management.base import BaseCommand
-from uuid import uuid4
 
 
 class Command(BaseCommand):
@@ -293,6 +292,8 @@ class Command(BaseCommand):
         - seed interests for student users
         """
         for user_payload in self.user_payload:
+            # work on a copy so the class level payload survives repeated seeding
+            user_payload = dict(user_payload)
             role = user_payload.pop("role")
 
             # student has interest
@@ -307,17 +308,14 @@ class Command(BaseCommand):
                 Role.objects.create(role=role, userRole=created_user)
 
                 # insert into Status table
-                status_unique_id = uuid4()
-                Status.objects.create(id=status_unique_id, userStatus=created_user)
+                Status.objects.create(userStatus=created_user)
 
                 # prepare Interest object for bulk_create
                 for interest in list_of_interest:
-                    unique_interest_id = uuid4()
                     interest_value = interest.get("interest")
 
                     interest_payload.append(
                         Interest(
-                            id=unique_interest_id,
                             interest=interest_value,
                             studentInterest=created_user,
                         )
@@ -335,10 +333,7 @@ class Command(BaseCommand):
                 Role.objects.create(role=role, userRole=created_user)
 
                 # insert into Status table
-                status_unique_id = uuid4()
-                Status.objects.create(id=status_unique_id, userStatus=created_user)
-
-            user_payload["role"] = role
+                Status.objects.create(userStatus=created_user)
 
     def seed_course_material_feedback_tracker(self) -> None:
         """
@@ -347,25 +342,21 @@ class Command(BaseCommand):
         - seed course feedbacks
         """
         for course_payload in self.course_payload:
-            course_unique_id = uuid4()
+            course_author_username = course_payload.get("author")
+            course_author = User.objects.filter(username=course_author_username).first()
 
             # Insert into Course
             created_course = Course.objects.create(
-                id=course_unique_id,
                 name=course_payload.get("name"),
                 category=course_payload.get("category"),
                 subcategory=course_payload.get("subcategory"),
                 description=course_payload.get("description"),
+                **Course.author_details(course_author),
             )
 
             # Insert into CourseTracker
-            course_author_username = course_payload.get("author")
-            course_author = User.objects.filter(username=course_author_username).first()
-            course_tracker_unique_id = uuid4()
-
             ### Insert course authors
             CourseTracker.objects.create(
-                id=course_tracker_unique_id,
                 user=course_author,
                 course=created_course,
                 profile="author",
@@ -373,24 +364,19 @@ class Command(BaseCommand):
 
             ### Insert enrolled students
             if "enrolledStudent" in course_payload:
-                course_tracker_unique_id_2 = uuid4()
                 enrolled_student_username = course_payload.get("enrolledStudent")
                 enrolled_student_user = User.objects.filter(
                     username=enrolled_student_username
                 ).first()
 
                 CourseTracker.objects.create(
-                    id=course_tracker_unique_id_2,
                     user=enrolled_student_user,
                     course=created_course,
                     profile="learner",
                 )
 
             # Insert into CourseMaterial
-            course_material_unique_id = uuid4()
-
             CourseMaterial.objects.create(
-                id=course_material_unique_id,
                 title=course_payload.get("courseMaterial").get("title"),
                 content=course_payload.get("courseMaterial").get("content"),
                 duration=course_payload.get("courseMaterial").get("duration"),
@@ -400,13 +386,11 @@ class Command(BaseCommand):
             # if course contains student feedback
             if "feedback" in course_payload:
                 course_feedback = course_payload.get("feedback").get("feedback")
-                course_feedback_unique_id = uuid4()
                 random_student_user = (
                     Role.objects.filter(role="student").first().userRole
                 )
 
                 StudentFeedback.objects.create(
-                    id=course_feedback_unique_id,
                     course=created_course,
                     student=random_student_user,
                     feedback=course_feedback,
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_course_author_columns(apps, schema_editor):
+    """
+    Copy each course's author from CourseTracker onto the new Course columns
+    """
+    Course = apps.get_model("api", "Course")
+    CourseTracker = apps.get_model("api", "CourseTracker")
+
+    authors = CourseTracker.objects.filter(profile="author").values_list(
+        "course_id", "user_id", "user__username", "user__first_name", "user__last_name"
+    )
+
+    courses = []
+    for course_id, user_id, username, first_name, last_name in authors.iterator():
+        courses.append(
+            Course(
+                id=course_id,
+                author_id=user_id,
+                author_username=username,
+                author_name=f"{first_name} {last_name}",
+            )
+        )
+
+    Course.objects.bulk_update(
+        courses, ["author", "author_username", "author_name"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_alter_course_id_alter_coursematerial_id_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='author',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='authoredCourse', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='author_name',
+            field=models.CharField(blank=True, default='', max_length=301),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='author_username',
+            field=models.CharField(blank=True, default='', max_length=150),
+        ),
+        migrations.RunPython(
+            backfill_course_author_columns, migrations.RunPython.noop
+        ),
+    ]
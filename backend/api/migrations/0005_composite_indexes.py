@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_course_author_columns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['category', 'created_at', 'id'], name='course_category_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursetracker',
+            index=models.Index(fields=['course', 'profile'], name='tracker_course_profile_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursetracker',
+            index=models.Index(fields=['user', 'profile', '-created_at'], name='tracker_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentfeedback',
+            index=models.Index(fields=['course', 'created_at'], name='feedback_course_date_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='coursetracker',
+            constraint=models.UniqueConstraint(condition=models.Q(('profile', 'author')), fields=('course',), name='unique_course_author', violation_error_message='A course can only have one author.'),
+        ),
+        migrations.AlterField(
+            model_name='coursetracker',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.course'),
+        ),
+        migrations.AlterField(
+            model_name='coursetracker',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='studentfeedback',
+            name='course',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.course'),
+        ),
+    ]
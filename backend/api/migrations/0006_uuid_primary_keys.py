@@ -0,0 +1,92 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:22
+
+import uuid
+from django.db import migrations, models
+
+
+# (model, column) pairs holding a UUID converted by this migration
+UUID_COLUMNS = [
+    ("course", "id"),
+    ("coursematerial", "id"),
+    ("coursematerial", "course_id"),
+    ("coursetracker", "id"),
+    ("coursetracker", "course_id"),
+    ("interest", "id"),
+    ("status", "id"),
+    ("studentfeedback", "id"),
+    ("studentfeedback", "course_id"),
+]
+
+
+def convert_uuid_columns(apps, schema_editor, sql_expression):
+    """
+    Rewrite stored UUID strings on databases without a native uuid type.
+
+    On those databases UUIDField stores 32 hex characters, while the old CharField
+    stored str(uuid4()) with dashes. Postgres casts the column itself during AlterField.
+    """
+    connection = schema_editor.connection
+    if connection.features.has_native_uuid_field:
+        return
+
+    for model_name, column in UUID_COLUMNS:
+        table = connection.ops.quote_name(apps.get_model("api", model_name)._meta.db_table)
+        column = connection.ops.quote_name(column)
+        schema_editor.execute(
+            f"UPDATE {table} SET {column} = {sql_expression % {'column': column}}"
+        )
+
+
+def strip_uuid_dashes(apps, schema_editor):
+    convert_uuid_columns(apps, schema_editor, "REPLACE(%(column)s, '-', '')")
+
+
+def add_uuid_dashes(apps, schema_editor):
+    convert_uuid_columns(
+        apps,
+        schema_editor,
+        "SUBSTR(%(column)s, 1, 8) || '-' || SUBSTR(%(column)s, 9, 4) || '-' || "
+        "SUBSTR(%(column)s, 13, 4) || '-' || SUBSTR(%(column)s, 17, 4) || '-' || "
+        "SUBSTR(%(column)s, 21)",
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='course',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='coursematerial',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='coursetracker',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='interest',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='status',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='studentfeedback',
+            name='id',
+            field=models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.RunPython(strip_uuid_dashes, add_uuid_dashes),
+    ]
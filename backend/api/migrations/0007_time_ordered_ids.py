@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:24
+
+import api.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_uuid_primary_keys'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='coursematerial',
+            name='id',
+            field=models.UUIDField(default=api.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='coursetracker',
+            name='id',
+            field=models.UUIDField(default=api.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='studentfeedback',
+            name='id',
+            field=models.UUIDField(default=api.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
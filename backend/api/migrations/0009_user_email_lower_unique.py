@@ -0,0 +1,22 @@
+# Enforce case-insensitive unique emails on auth_user. Blank emails (eg: superusers
+# created without one) are left out of the index. `email > ''` is used rather than
+# `email <> ''` so that the filter in CustomUserSerializer.validate_email implies the
+# index predicate and the partial index is used for the lookup.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        # after the auth migrations which rebuild auth_user (and drop its indexes) on sqlite
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('api', '0008_revoked_token'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE UNIQUE INDEX auth_user_email_lower_uniq ON auth_user (LOWER(email)) WHERE email > ''",
+            reverse_sql="DROP INDEX auth_user_email_lower_uniq",
+        ),
+    ]
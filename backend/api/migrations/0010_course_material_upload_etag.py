@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:09
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_upload_etag(apps, schema_editor):
+    """
+    Hash the existing course material uploads. Missing files are left without ETag
+    """
+    CourseMaterial = apps.get_model("api", "CourseMaterial")
+
+    materials = []
+    for material in CourseMaterial.objects.exclude(upload="").exclude(upload=None):
+        digest = hashlib.sha256()
+        try:
+            with material.upload.open("rb") as file:
+                for chunk in file.chunks():
+                    digest.update(chunk)
+        except FileNotFoundError:
+            continue
+
+        material.upload_etag = f'"{digest.hexdigest()}"'
+        materials.append(material)
+
+    CourseMaterial.objects.bulk_update(materials, ["upload_etag"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_user_email_lower_unique'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursematerial',
+            name='upload_etag',
+            field=models.CharField(blank=True, default='', max_length=66),
+        ),
+        migrations.RunPython(backfill_upload_etag, migrations.RunPython.noop),
+    ]
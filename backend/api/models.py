@@ -5,6 +5,8 @@ from uuid import uuid4
 from django.core.validators import RegexValidator
 from django.core.validators import MinLengthValidator
 from django.contrib.auth.models import User
+from .ids import uuid7
+from .downloads import file_etag
 
 
 class Role(models.Model):
@@ -55,9 +57,7 @@ class Status(models.Model):
         AWAY: "Away",
     }
 
-    id = models.CharField(
-        max_length=100, primary_key=True, db_index=True, default=uuid4()
-    )
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     status = models.CharField(
         max_length=6, choices=STATUS_CHOICES, default=ACTIVE, null=False, blank=False
     )
@@ -90,9 +90,7 @@ class Interest(models.Model):
     Model for user's interest
     """
 
-    id = models.CharField(
-        max_length=100, primary_key=True, db_index=True, default=uuid4()
-    )
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     interest = models.CharField(
         max_length=99,
         null=False,
@@ -118,9 +116,7 @@ class Course(models.Model):
     Model for Course
     """
 
-    id = models.CharField(
-        max_length=100, primary_key=True, db_index=True, default=uuid4()
-    )
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     name = models.CharField(max_length=250, null=False, blank=False)
     category = models.CharField(max_length=250, null=False, blank=False)
     subcategory = models.CharField(max_length=250, null=False, blank=False)
@@ -131,8 +127,41 @@ class Course(models.Model):
     studentFeedback = models.ManyToManyField(
         User, through="StudentFeedback", related_name="studentFeedback"
     )
+    # Denormalized author details - kept in sync on write so listings skip CourseTracker
+    author = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="authoredCourse",
+    )
+    author_username = models.CharField(max_length=150, blank=True, default="")
+    author_name = models.CharField(max_length=301, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        """
+        Index to list courses of a category in creation order.
+        """
+
+        indexes = [
+            models.Index(
+                fields=["category", "created_at", "id"],
+                name="course_category_recent_idx",
+            )
+        ]
+
+    @staticmethod
+    def author_details(user) -> dict:
+        """
+        Return denormalized author column values for `user`
+        """
+        return {
+            "author": user,
+            "author_username": user.username,
+            "author_name": f"{user.first_name} {user.last_name}",
+        }
+
     def __str__(self):
         return f"Course name:: {self.name}\n"
 
@@ -149,11 +178,10 @@ class CourseTracker(models.Model):
         AUTHOR: "Author",
         LEARNER: "Learner",
     }
-    id = models.CharField(
-        max_length=100, primary_key=True, db_index=True, default=uuid4()
-    )
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    # FK indexes are covered by the composite indexes below
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, db_index=False)
     is_blocked = models.BooleanField(blank=False, null=False, default=False)
     profile = models.CharField(
         choices=PROFILE_CHOICES, max_length=50, null=False, blank=False
@@ -163,6 +191,8 @@ class CourseTracker(models.Model):
     class Meta:
         """
         Constraint to ensure profile value must be in (author, learner).
+        Constraint to ensure a course has at most one author.
+        Indexes to look up a course's learners and a user's recent courses.
         """
 
         constraints = [
@@ -170,7 +200,22 @@ class CourseTracker(models.Model):
                 check=models.Q(profile="author") | models.Q(profile="learner"),
                 name="Profile constraint",
                 violation_error_message="Profile value must be in (author, learner).",
-            )
+            ),
+            models.UniqueConstraint(
+                fields=["course"],
+                condition=models.Q(profile="author"),
+                name="unique_course_author",
+                violation_error_message="A course can only have one author.",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["course", "profile"], name="tracker_course_profile_idx"
+            ),
+            models.Index(
+                fields=["user", "profile", "-created_at"],
+                name="tracker_user_recent_idx",
+            ),
         ]
 
     def __str__(self):
@@ -182,14 +227,24 @@ class StudentFeedback(models.Model):
     Model for Student feedback - Record feedback left by user on a course
     """
 
-    id = models.CharField(
-        max_length=100, primary_key=True, db_index=True, default=uuid4()
-    )
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     student = models.ForeignKey(User, on_delete=models.CASCADE, related_name="student")
-    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    # FK index is covered by the composite index below
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, db_index=False)
     feedback = models.TextField(null=False, blank=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        """
+        Index to list a course's feedback by date.
+        """
+
+        indexes = [
+            models.Index(
+                fields=["course", "created_at"], name="feedback_course_date_idx"
+            )
+        ]
+
     def __str__(self):
         return f"Feedback:: {self.feedback} provided by {self.student.first_name} {self.student.last_name}"
 
@@ -199,12 +254,97 @@ class CourseMaterial(models.Model):
     Model for Course material
     """
 
-    id = models.CharField(
-        max_length=100, primary_key=True, db_index=True, default=uuid4()
-    )
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     title = models.CharField(max_length=250, null=False, blank=False)
     content = models.TextField(null=False, blank=False)
     # uploadURL = models.CharField(max_length=250, null=True)
     upload = models.FileField(upload_to="materials/", null=True, blank=True)
+    # strong ETag of the upload content, validates Range / If-Range requests
+    upload_etag = models.CharField(max_length=66, blank=True, default="")
     duration = models.PositiveSmallIntegerField(null=False, blank=False)  # in minutes
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="course")
+
+    # name of the upload `upload_etag` was computed for
+    _etag_upload_name = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if instance.__dict__.get("upload_etag"):
+            instance._etag_upload_name = instance.__dict__.get("upload")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # hash the upload once, when it is added or replaced (skipped if upload is deferred)
+        if "upload" in self.__dict__:
+            if not self.upload:
+                self.upload_etag = ""
+            elif (
+                not self.upload._committed
+                or self.upload.name != self._etag_upload_name
+            ):
+                self.upload_etag = file_etag(self.upload)
+
+        super().save(*args, **kwargs)
+
+        if self.upload_etag:
+            self._etag_upload_name = self.upload.name
+
+
+class RevokedToken(models.Model):
+    """
+    Model for revoked JWT - Record jti of access/refresh tokens revoked before they expire
+    """
+
+    jti = models.CharField(max_length=255, primary_key=True)
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Revoked token:: {self.jti}"
+
+
+class UploadSession(models.Model):
+    """
+    Model for chunked course material upload - holds the fields of the course material
+    created once all parts are received
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    course = models.ForeignKey(
+        Course, on_delete=models.CASCADE, related_name="upload_sessions"
+    )
+    filename = models.CharField(max_length=100)
+    title = models.CharField(max_length=250)
+    content = models.TextField()
+    duration = models.PositiveSmallIntegerField()  # in minutes
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Upload session:: {self.filename} for course {self.course_id}"
+
+
+class UploadPart(models.Model):
+    """
+    Model for a part received by an upload session
+    """
+
+    session = models.ForeignKey(
+        UploadSession, on_delete=models.CASCADE, related_name="parts"
+    )
+    number = models.PositiveIntegerField()
+    size = models.PositiveBigIntegerField()
+    checksum = models.CharField(max_length=64)  # hex sha256 of the part
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["session", "number"], name="unique_upload_part_number"
+            )
+        ]
+
+    def __str__(self):
+        return f"Upload part:: {self.number} of session {self.session_id}"
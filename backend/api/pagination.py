@@ -0,0 +1,102 @@
+"""
+Keyset (cursor) pagination helpers
+
+A page is fetched with `WHERE (ordering fields) > (last row of previous page) LIMIT n`,
+so page N costs the same as page 1. The cursor handed to clients is an opaque,
+url-safe token encoding the ordering values of the last row returned.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from functools import reduce
+from uuid import UUID
+
+from django.db.models import Q
+from rest_framework import serializers
+
+DEFAULT_PAGE_SIZE = 50
+
+
+def _encode_value(value):
+    # keep full microsecond precision - DjangoJSONEncoder truncates datetimes to ms
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def encode_cursor(values: list) -> str:
+    """
+    Encode ordering values of a row into an opaque cursor token
+    """
+    payload = json.dumps(values, default=_encode_value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, fields: tuple) -> list:
+    """
+    Decode a cursor token, converting each value with the matching serializer field.
+    Raise ValidationError if the token is malformed
+    """
+    error = f"You have provided ({token}). cursor is invalid."
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise serializers.ValidationError(error)
+
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise serializers.ValidationError(error)
+
+    try:
+        return [field.to_internal_value(value) for field, value in zip(fields, values)]
+    except serializers.ValidationError:
+        raise serializers.ValidationError(error)
+
+
+def keyset_filter(ordering: tuple, values: list) -> Q:
+    """
+    Build a Q matching rows strictly after `values` in `ordering`
+
+    eg: ordering = ("created_at", "id") -> created_at > v0 OR (created_at = v0 AND id > v1)
+    """
+    conditions = []
+    for index, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        equal_prefix = {
+            previous.lstrip("-"): value
+            for previous, value in zip(ordering[:index], values[:index])
+        }
+        conditions.append(Q(**equal_prefix) & Q(**{f"{name}__{lookup}": values[index]}))
+
+    return reduce(lambda left, right: left | right, conditions)
+
+
+def paginate_keyset(queryset, ordering: tuple, cursor=None, page_size=None):
+    """
+    Return (rows, next_cursor) for one page of a `.values()` queryset
+
+    Rows must include every field in `ordering`. `ordering` must end with a unique field
+    (eg: id) so the sort is stable. next_cursor is None on the last page.
+    """
+    page_size = page_size or DEFAULT_PAGE_SIZE
+
+    queryset = queryset.order_by(*ordering)
+    if cursor is not None:
+        queryset = queryset.filter(keyset_filter(ordering, cursor))
+
+    rows = list(queryset[: page_size + 1])
+
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last_row = rows[-1]
+        next_cursor = encode_cursor(
+            [last_row[field.lstrip("-")] for field in ordering]
+        )
+
+    return rows, next_cursor
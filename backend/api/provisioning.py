@@ -0,0 +1,255 @@
+"""
+Bulk user provisioning - register a cohort of users from a CSV or JSONL file
+
+Each record holds the same fields as POST /user/register:
+
+    CSV:   username,first_name,last_name,email,role,password,interest
+           (interests separated by `;`)
+    JSONL: {"username": ..., "role": ..., "interest": ["math", ...]}
+
+Passwords are hashed in parallel worker processes, then `User`, `Role`, `Status` and
+`Interest` rows are inserted with `bulk_create`, one transaction per chunk of users.
+Invalid records are skipped and reported with their row number.
+"""
+
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.db.utils import IntegrityError
+from rest_framework import serializers
+
+from .models import Interest, Role, Status
+
+FORMATS = ("csv", "jsonl")
+
+
+class ProvisionUserSerializer(serializers.Serializer):
+    """
+    Serializer for a single record of a provisioning file
+    """
+
+    username = serializers.CharField(max_length=150)
+    first_name = serializers.CharField(max_length=150)
+    last_name = serializers.CharField(max_length=150)
+    email = serializers.CharField(max_length=254)
+    role = serializers.ChoiceField(choices=list(Role.ROLE_CHOICES))
+    password = serializers.CharField(write_only=True)
+    interest = serializers.ListField(
+        child=serializers.RegexField(
+            r"^[a-z][a-z_]*[a-z]$",
+            max_length=99,
+            error_messages={"invalid": "interest must be valid and in small letters"},
+        ),
+        required=False,
+    )
+
+    class Meta:
+        fields = [
+            "username",
+            "first_name",
+            "last_name",
+            "email",
+            "role",
+            "password",
+            "interest",
+        ]
+
+    def to_internal_value(self, data):
+        interests = data.get("interest")
+
+        # CSV: "math;science", JSONL: ["math"] or [{"interest": "math"}] as in /user/register
+        if isinstance(interests, str):
+            interests = [interest for interest in interests.split(";") if interest]
+        elif isinstance(interests, list):
+            interests = [
+                interest.get("interest") if isinstance(interest, dict) else interest
+                for interest in interests
+            ]
+
+        if interests is not None:
+            data = {**data, "interest": interests}
+
+        return super().to_internal_value(data)
+
+
+def read_records(lines, format: str) -> list:
+    """
+    Parse an iterable of text lines into a list of record dicts
+    """
+    if format == "csv":
+        return [dict(record) for record in csv.DictReader(lines)]
+
+    if format == "jsonl":
+        records = []
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise serializers.ValidationError(
+                    f"Line {line_number} is not valid JSON ({e.msg})."
+                )
+            if not isinstance(record, dict):
+                raise serializers.ValidationError(
+                    f"Line {line_number} must be a JSON object."
+                )
+            records.append(record)
+        return records
+
+    raise serializers.ValidationError(
+        f"You have provided ({format}). format must be in {FORMATS}."
+    )
+
+
+def guess_format(filename: str) -> str:
+    """
+    Return the provisioning format matching the extension of `filename`
+    """
+    extension = os.path.splitext(filename)[1].lstrip(".").lower()
+    return "jsonl" if extension in ("jsonl", "ndjson") else extension
+
+
+def _init_hash_worker(settings_module: str) -> None:
+    # spawned workers (eg: macOS, Windows) start without django configured
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    django.setup()
+
+
+def hash_passwords(passwords: list, workers=None) -> list:
+    """
+    Hash `passwords` with the configured password hasher, spreading the work over
+    `workers` processes (default: one per CPU)
+    """
+    workers = workers or settings.PROVISIONING_HASH_WORKERS or os.cpu_count() or 1
+    workers = min(workers, len(passwords))
+
+    if workers <= 1:
+        return [make_password(password) for password in passwords]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_hash_worker,
+        initargs=(os.environ["DJANGO_SETTINGS_MODULE"],),
+    ) as executor:
+        chunksize = max(1, len(passwords) // (workers * 4))
+        return list(executor.map(make_password, passwords, chunksize=chunksize))
+
+
+def validate_records(records: list) -> tuple:
+    """
+    Validate every record, returning (valid rows, errors)
+
+    A row is a (row number, validated data) pair. Usernames and emails must be unique
+    within the file and must not be registered yet (checked with one query each).
+    """
+    rows = []
+    errors = []
+
+    for row_number, record in enumerate(records, start=1):
+        serializer = ProvisionUserSerializer(data=record)
+        if serializer.is_valid():
+            rows.append((row_number, serializer.validated_data))
+        else:
+            errors.append(row_error(row_number, record, serializer.errors))
+
+    usernames = {data["username"] for _, data in rows}
+    emails = {data["email"].lower() for _, data in rows}
+    taken_usernames = set(
+        User.objects.filter(username__in=usernames).values_list("username", flat=True)
+    )
+    taken_emails = set(
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=emails, email__gt="")
+        .values_list("email_lower", flat=True)
+    )
+
+    valid_rows = []
+    for row_number, data in rows:
+        username = data["username"]
+        email = data["email"].lower()
+        record_errors = {}
+
+        if username in taken_usernames:
+            record_errors["username"] = ["Username must be unique"]
+        if email in taken_emails:
+            record_errors["email"] = ["Email must be unique"]
+
+        if record_errors:
+            errors.append(row_error(row_number, data, record_errors))
+            continue
+
+        # later rows reusing a username/email of this row are rejected
+        taken_usernames.add(username)
+        taken_emails.add(email)
+        valid_rows.append((row_number, data))
+
+    return valid_rows, errors
+
+
+def row_error(row_number: int, record: dict, errors: dict) -> dict:
+    return {"row": row_number, "username": record.get("username"), "errors": errors}
+
+
+def create_users(rows: list, hashed_passwords: list) -> None:
+    """
+    Insert one chunk of validated rows with their related Role, Status and Interest rows
+    """
+    users = [
+        User(
+            username=data["username"],
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+            email=data["email"],
+            password=hashed_password,
+        )
+        for (_, data), hashed_password in zip(rows, hashed_passwords)
+    ]
+
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        Role.objects.bulk_create(
+            Role(role=data["role"], userRole=user) for (_, data), user in zip(rows, users)
+        )
+        Status.objects.bulk_create(Status(userStatus=user) for user in users)
+        Interest.objects.bulk_create(
+            Interest(interest=interest, studentInterest=user)
+            for (_, data), user in zip(rows, users)
+            for interest in data.get("interest", [])
+        )
+
+
+def provision_users(records: list, chunk_size=None, workers=None) -> dict:
+    """
+    Register every valid record, returning the created usernames and per-row errors
+    """
+    chunk_size = chunk_size or settings.PROVISIONING_CHUNK_SIZE
+
+    rows, errors = validate_records(records)
+    hashed_passwords = hash_passwords([data["password"] for _, data in rows], workers)
+
+    created = []
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start : start + chunk_size]
+        try:
+            create_users(chunk, hashed_passwords[start : start + chunk_size])
+        except IntegrityError as e:
+            # eg: a username registered by someone else since validation - the whole
+            # chunk was rolled back
+            errors.extend(
+                row_error(row_number, data, {"non_field_errors": list(e.args)})
+                for row_number, data in chunk
+            )
+        else:
+            created.extend(data["username"] for _, data in chunk)
+
+    errors.sort(key=lambda error: error["row"])
+    return {"created": created, "errors": errors}
@@ -0,0 +1,161 @@
+"""
+Token revocation backed by a per-process Bloom filter
+
+Every authenticated request has to know whether its token was revoked. Revoked jtis are
+kept in a Bloom filter in memory, so the common case (token not revoked) needs no I/O.
+Only filter hits, which are revoked tokens or rare false positives, query the database.
+
+The filter is refreshed incrementally with the rows revoked since the last refresh, and
+rebuilt periodically from the unexpired rows so expired jtis drop out.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+
+from .models import RevokedToken
+
+# re-read rows revoked shortly before the last refresh, in case their transaction
+# committed after that refresh ran
+REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+class BloomFilter:
+    """
+    Bloom filter of strings - no false negatives, false positives at about `error_rate`
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        # double hashing: position_i = h1 + i * h2
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, item: str) -> None:
+        # only count items setting a new bit, so re-adding a jti (eg: the rows re-read
+        # in REFRESH_OVERLAP) does not push `count` towards `capacity`
+        added = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+
+        if added:
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class RevocationList:
+    """
+    Process wide view of revoked token jtis
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._watermark = None
+        self._last_refresh = 0.0
+        self._last_rebuild = 0.0
+
+    def revoke(self, jti: str, expires_at: datetime) -> None:
+        """
+        Record `jti` as revoked until `expires_at`
+        """
+        RevokedToken.objects.get_or_create(jti=jti, defaults={"expires_at": expires_at})
+
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def refresh(self) -> None:
+        """
+        Rebuild the filter from the database now
+        """
+        with self._lock:
+            self._rebuild()
+            self._last_refresh = self._last_rebuild = time.monotonic()
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Return whether `jti` was revoked. Only queries the database on a filter hit
+        """
+        self._refresh_if_stale()
+
+        if jti not in self._bloom:
+            return False
+
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def _refresh_if_stale(self) -> None:
+        now = time.monotonic()
+
+        if self._bloom is not None and (
+            now - self._last_refresh < settings.TOKEN_REVOCATION_REFRESH_SECONDS
+        ):
+            return
+
+        with self._lock:
+            # another thread may have refreshed while we waited for the lock
+            if self._bloom is not None and (
+                now - self._last_refresh < settings.TOKEN_REVOCATION_REFRESH_SECONDS
+            ):
+                return
+
+            if (
+                self._bloom is None
+                or self._bloom.count > self._bloom.capacity
+                or now - self._last_rebuild > settings.TOKEN_REVOCATION_REBUILD_SECONDS
+            ):
+                self._rebuild()
+                self._last_rebuild = now
+            else:
+                self._load(
+                    RevokedToken.objects.filter(
+                        revoked_at__gte=self._watermark - REFRESH_OVERLAP
+                    ),
+                    self._bloom,
+                )
+
+            self._last_refresh = now
+
+    def _rebuild(self) -> None:
+        unexpired = RevokedToken.objects.filter(expires_at__gt=datetime.now(timezone.utc))
+        capacity = max(settings.TOKEN_REVOCATION_CAPACITY, 2 * unexpired.count())
+
+        bloom = BloomFilter(capacity, settings.TOKEN_REVOCATION_ERROR_RATE)
+        self._watermark = None
+        self._load(unexpired, bloom)
+        self._bloom = bloom
+
+    def _load(self, revoked_tokens, bloom: BloomFilter) -> None:
+        latest = None
+        for jti, revoked_at in revoked_tokens.values_list("jti", "revoked_at").iterator():
+            bloom.add(jti)
+            latest = revoked_at if latest is None else max(latest, revoked_at)
+
+        if latest is not None:
+            self._watermark = latest
+        elif self._watermark is None:
+            self._watermark = datetime.now(timezone.utc)
+
+
+revocation_list = RevocationList()
@@ -1,23 +1,79 @@
+from django.conf import settings
 from django.contrib.auth.models import User
 from rest_framework import serializers
 from ..models import Course
+from ..pagination import decode_cursor
 from uuid import uuid4
 
+COURSE_CATEGORIES = ["business", "development", "personal_development"]
+
 
 class ListCoursesSerializer(serializers.Serializer):
     category = serializers.CharField()
     limit = serializers.IntegerField(required=False)
+    cursor = serializers.CharField(required=False)
+
+    class Meta:
+        fields = ("category", "limit", "cursor")
+
+    def validate_category(self, data):
+        if data not in COURSE_CATEGORIES:
+            raise serializers.ValidationError(
+                f"You have provided ({data}). category must be one of {COURSE_CATEGORIES}"
+            )
+        return data
+
+    def validate_limit(self, data):
+        if data <= 0:
+            raise serializers.ValidationError(
+                f"You have provided ({data}). limit value must be a positive integer."
+            )
+        return data
+
+    def validate_cursor(self, data):
+        # cursor holds the (created_at, id) of the last course of the previous page
+        return decode_cursor(
+            data, (serializers.DateTimeField(), serializers.UUIDField())
+        )
+
+
+class ListUserCoursesSerializer(serializers.Serializer):
+    category = serializers.CharField(required=False)
+    subcategory = serializers.CharField(required=False)
+    counts = serializers.BooleanField(required=False, default=False)
+    limit = serializers.IntegerField(required=False)
+    cursor = serializers.CharField(required=False)
 
     class Meta:
-        fields = ("category", "limit")
+        fields = ("category", "subcategory", "counts", "limit", "cursor")
 
     def validate_category(self, data):
-        if data not in ["business", "development", "personal_development"]:
+        if data not in COURSE_CATEGORIES:
+            raise serializers.ValidationError(
+                f"You have provided ({data}). category must be one of {COURSE_CATEGORIES}"
+            )
+        return data
+
+    def validate_limit(self, data):
+        if data <= 0:
             raise serializers.ValidationError(
-                f"You have provided ({data}). category must be one of ['business', 'development', 'personal_development']"
+                f"You have provided ({data}). limit value must be a positive integer."
             )
         return data
 
+    def validate_cursor(self, data):
+        # cursor holds the (created_at, id) of the last course of the previous page
+        return decode_cursor(
+            data, (serializers.DateTimeField(), serializers.UUIDField())
+        )
+
+
+class ListTopCoursesSerializer(serializers.Serializer):
+    limit = serializers.IntegerField(required=False, default=3)
+
+    class Meta:
+        fields = ("limit",)
+
     def validate_limit(self, data):
         if data <= 0:
             raise serializers.ValidationError(
@@ -37,9 +93,9 @@ class CreateCourseSerializer(serializers.Serializer):
         fields = ("name", "category", "subcategory", "description", "author")
 
     def validate_category(self, data):
-        if data not in ["business", "development", "personal_development"]:
+        if data not in COURSE_CATEGORIES:
             raise serializers.ValidationError(
-                f"You have provided ({data}). category must be one of ['business', 'development', 'personal_development']"
+                f"You have provided ({data}). category must be one of {COURSE_CATEGORIES}"
             )
         return data
 
@@ -71,3 +127,45 @@ class RemoveStudentFromCourseSerializer(serializers.Serializer):
 
     class Meta:
         fields = ("authenticatedUsername", "studentUsername")
+
+
+class BulkEnrollCourseSerializer(serializers.Serializer):
+    """
+    Serializer for POST /courses/<course_id>/students endpoint
+    """
+
+    username = serializers.CharField()
+    studentUsernames = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.ENROLLMENT_MAX_USERNAMES,
+    )
+
+    class Meta:
+        fields = ("username", "studentUsernames")
+
+
+class BulkUpdateCourseUserBlockStatusSerializer(serializers.Serializer):
+    """
+    Serializer for PATCH /courses/<course_id>/students/block-status endpoint
+    """
+
+    username = serializers.CharField()
+    isBlocked = serializers.BooleanField()
+    studentIds = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=settings.ENROLLMENT_MAX_USERNAMES,
+        required=False,
+    )
+    enrolledAfter = serializers.DateTimeField(required=False)
+
+    class Meta:
+        fields = ("username", "isBlocked", "studentIds", "enrolledAfter")
+
+    def validate(self, data):
+        if "studentIds" not in data and "enrolledAfter" not in data:
+            raise serializers.ValidationError(
+                "Provide studentIds and/or enrolledAfter to select the learners."
+            )
+        return data
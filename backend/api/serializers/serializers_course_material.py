@@ -1,4 +1,5 @@
 from django.contrib.auth.models import User
+from django.core.exceptions import SuspiciousFileOperation
 from rest_framework import serializers
 from ..models import Course, CourseMaterial
 from uuid import uuid4
@@ -12,3 +13,43 @@ class AddCourseMaterialSerializer(serializers.Serializer):
 
     class Meta:
         fields = ("title", "content", "upload", "duration")
+
+
+class InitiateCourseMaterialUploadSerializer(serializers.Serializer):
+    title = serializers.CharField(max_length=250)
+    content = serializers.CharField()
+    duration = serializers.IntegerField(min_value=0, max_value=32767)
+    filename = serializers.RegexField(
+        r"^[^/\\]+$",
+        max_length=100,
+        error_messages={"invalid": "filename must not contain a path"},
+    )
+
+    class Meta:
+        fields = ("title", "content", "duration", "filename")
+
+    def validate_filename(self, data):
+        # reject names the storage would refuse (eg: "..") before any part is uploaded
+        try:
+            CourseMaterial.upload.field.generate_filename(None, data)
+        except SuspiciousFileOperation:
+            raise serializers.ValidationError("filename is not valid")
+        return data
+
+
+class UploadPartSerializer(serializers.Serializer):
+    partNumber = serializers.IntegerField(min_value=1)
+    checksum = serializers.RegexField(
+        r"^[0-9a-fA-F]{64}$",
+        error_messages={"invalid": "checksum must be a hex sha256"},
+    )
+
+    class Meta:
+        fields = ("partNumber", "checksum")
+
+
+class CompleteCourseMaterialUploadSerializer(serializers.Serializer):
+    parts = UploadPartSerializer(many=True, allow_empty=False)
+
+    class Meta:
+        fields = ("parts",)
@@ -1,6 +1,16 @@
-from rest_framework_simplejwt.serializers import TokenObtainSerializer, RefreshToken
+from datetime import datetime, timezone
+
+from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import (
+    TokenObtainSerializer,
+    TokenRefreshSerializer,
+    RefreshToken,
+)
+from rest_framework_simplejwt.settings import api_settings
 
 from ..models import Role
+from ..revocation import revocation_list
 
 
 class MyTokenObtainPairSerializer(TokenObtainSerializer):
@@ -31,3 +41,50 @@ class MyTokenObtainPairSerializer(TokenObtainSerializer):
         data["access"] = str(refresh.access_token)
 
         return data
+
+
+class MyTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Serializer for POST /token/refresh endpoint - reject revoked refresh tokens
+    """
+
+    def validate(self, attrs):
+        try:
+            refresh = self.token_class(attrs["refresh"])
+        except TokenError as e:
+            raise InvalidToken(e.args[0])
+
+        if revocation_list.is_revoked(refresh[api_settings.JTI_CLAIM]):
+            raise InvalidToken("Token has been revoked")
+
+        return super().validate(attrs)
+
+
+class TokenRevokeSerializer(serializers.Serializer):
+    """
+    Serializer for POST /token/revoke endpoint
+    """
+
+    refresh = serializers.CharField()
+
+    class Meta:
+        fields = "refresh"
+
+    def validate_refresh(self, value):
+        try:
+            refresh = RefreshToken(value)
+        except TokenError as e:
+            raise serializers.ValidationError(e.args[0])
+
+        user_id = self.context["request"].user.id
+        if str(refresh.get(api_settings.USER_ID_CLAIM)) != str(user_id):
+            raise serializers.ValidationError("Refresh token does not belong to user")
+
+        return refresh
+
+
+def token_expiry(token) -> datetime:
+    """
+    Return the expiry of a validated token as an aware datetime
+    """
+    return datetime.fromtimestamp(token["exp"], tz=timezone.utc)
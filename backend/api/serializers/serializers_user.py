@@ -1,8 +1,9 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
 from ..models import Role, Interest, Status
-from uuid import uuid4
+from ..pagination import decode_cursor
 from django.db import transaction
+from django.db.models.functions import Lower
 
 
 class InterestSerializer(serializers.Serializer):
@@ -37,19 +38,20 @@ class CustomUserSerializer(serializers.Serializer):
 
     def validate_email(self, data):
         """
-        Validate email is unique. Else raise ValidationError
+        Validate email is unique (case-insensitive). Else raise ValidationError
         """
 
-        # get all emails
-        emails = list(User.objects.values_list("email", flat=True))
-
-        # validate email is unique, else raise ValidationError
-        if data in emails:
+        # single lookup on the LOWER(email) unique index (see migration 0009)
+        email_exists = (
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower=data.lower(), email__gt="")
+            .exists()
+        )
 
+        if email_exists:
             raise serializers.ValidationError("Email must be unique")
 
-        else:
-            return data
+        return data
 
     def create(self, validated_data):
         """
@@ -74,10 +76,8 @@ class CustomUserSerializer(serializers.Serializer):
                 if interest_key_exists == True:
                     interest_payload = []
                     for interest in interests:
-                        interest_unique_id = uuid4()
                         interest_payload.append(
                             Interest(
-                                id=interest_unique_id,
                                 interest=interest["interest"],
                                 studentInterest=created_user,
                             )
@@ -85,10 +85,34 @@ class CustomUserSerializer(serializers.Serializer):
                     Interest.objects.bulk_create(interest_payload)
 
                 # Insert into Status table
-                status_unique_id = uuid4()
-                Status.objects.create(id=status_unique_id, userStatus=created_user)
+                Status.objects.create(userStatus=created_user)
 
         except Exception as e:
             raise serializers.ValidationError(e.args)
 
         return created_user
+
+
+class ListUsersSerializer(serializers.Serializer):
+    """
+    Serializer for POST /users endpoint
+    """
+
+    username = serializers.CharField()
+    role = serializers.ChoiceField(choices=list(Role.ROLE_CHOICES), required=False)
+    limit = serializers.IntegerField(required=False)
+    cursor = serializers.CharField(required=False)
+
+    class Meta:
+        fields = ("username", "role", "limit", "cursor")
+
+    def validate_limit(self, data):
+        if data <= 0:
+            raise serializers.ValidationError(
+                f"You have provided ({data}). limit value must be a positive integer."
+            )
+        return data
+
+    def validate_cursor(self, data):
+        # cursor holds the (fullname, username) of the last user of the previous page
+        return decode_cursor(data, (serializers.CharField(), serializers.CharField()))
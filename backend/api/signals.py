@@ -0,0 +1,108 @@
+"""
+Signal handlers keeping denormalized columns in sync
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .authentication import active_user_cache_key
+from .models import Course, CourseTracker
+
+AUTHOR_FIELDS = ("username", "first_name", "last_name")
+
+
+def loaded_author_fields(user):
+    # read from __dict__ so deferred fields are not fetched - None if any is missing
+    values = tuple(user.__dict__.get(field) for field in AUTHOR_FIELDS)
+    return None if None in values else values
+
+
+@receiver(post_init, sender=User)
+def remember_author_fields(sender, instance, **kwargs):
+    """
+    Remember the stored username / name of a user to detect changes on save
+    """
+    instance._stored_author_fields = (
+        loaded_author_fields(instance) if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=User)
+def sync_course_author_details(sender, instance, created, update_fields, **kwargs):
+    """
+    Propagate a user's username / name change to the courses they authored
+    """
+    stored = instance._stored_author_fields
+    instance._stored_author_fields = current = loaded_author_fields(instance)
+
+    if created:
+        return
+
+    # skip saves that cannot change author details (eg: last_login update on login)
+    if update_fields is not None and not set(AUTHOR_FIELDS).intersection(update_fields):
+        return
+
+    # skip saves that did not change them (eg: set_password() then save())
+    if stored is not None and stored == current:
+        return
+
+    author_details = Course.author_details(instance)
+    author_details.pop("author")
+    Course.objects.filter(author=instance).update(**author_details)
+
+
+@receiver(post_save, sender=CourseTracker)
+def sync_course_author(sender, instance, created, **kwargs):
+    """
+    Keep the author columns of a course in sync with its author CourseTracker row,
+    whichever code path (views, admin, shell) creates or edits it
+    """
+    if instance.profile == CourseTracker.AUTHOR:
+        author_details = Course.author_details(instance.user)
+
+        # courses created with their author details (CreateUserCourseView, seed_db)
+        if CourseTracker.course.is_cached(instance) and (
+            instance.course.author_id,
+            instance.course.author_username,
+            instance.course.author_name,
+        ) == (
+            instance.user_id,
+            author_details["author_username"],
+            author_details["author_name"],
+        ):
+            return
+
+        Course.objects.filter(pk=instance.course_id).exclude(
+            author=instance.user,
+            author_username=author_details["author_username"],
+            author_name=author_details["author_name"],
+        ).update(**author_details)
+    elif not created:
+        # an author row changed to learner
+        clear_course_author(instance)
+
+
+@receiver(post_delete, sender=CourseTracker)
+def clear_course_author_on_delete(sender, instance, **kwargs):
+    """
+    Clear the author columns of a course whose author CourseTracker row is deleted
+    """
+    if instance.profile == CourseTracker.AUTHOR:
+        clear_course_author(instance)
+
+
+def clear_course_author(tracker: CourseTracker) -> None:
+    Course.objects.filter(pk=tracker.course_id, author_id=tracker.user_id).update(
+        author=None, author_username="", author_name=""
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def clear_active_user_cache(sender, instance, **kwargs):
+    """
+    Make stateless authentication re-check a user that was disabled or deleted
+    """
+    cache.delete(active_user_cache_key(instance.pk))
@@ -0,0 +1,48 @@
+"""
+Short-lived signed URLs for course material attachments
+
+A signed URL carries the storage name and ETag of the attachment and its expiry time,
+signed with HMAC (SECRET_KEY). Serving it only needs to check the signature - no token
+decoding, no cache and no database lookup, in any worker - and since the content of a
+URL never changes it can be cached by proxies until it expires.
+
+The payload is signed, not encrypted: the storage name (eg: materials/notes.pdf) can be
+read from the URL. It is no secret - the course detail listing already publishes the
+file name as `fileName` under the fixed `materials/` prefix, and MEDIA_ROOT is not
+served - and the signature keeps it from being changed.
+"""
+
+import time
+
+from django.conf import settings
+from django.core import signing
+
+SALT = "api.signed_urls.download"
+
+
+def sign_download(name: str, etag: str, max_age=None) -> tuple:
+    """
+    Return (token, expiry as a unix timestamp) granting access to the file `name`
+    """
+    if max_age is None:
+        max_age = settings.SIGNED_DOWNLOAD_URL_MAX_AGE
+
+    expires = int(time.time()) + max_age
+    token = signing.dumps({"n": name, "e": etag, "x": expires}, salt=SALT)
+    return token, expires
+
+
+def verify_download(token: str) -> tuple:
+    """
+    Return (name, etag, seconds until expiry) of a signed download token
+
+    Raise signing.BadSignature if the token was tampered with and
+    signing.SignatureExpired if it has expired.
+    """
+    payload = signing.loads(token, salt=SALT)
+
+    remaining = payload["x"] - int(time.time())
+    if remaining <= 0:
+        raise signing.SignatureExpired("Download URL has expired")
+
+    return payload["n"], payload["e"], remaining
@@ -0,0 +1,553 @@
+"""
+Test Course APIs
+"""
+
+from rest_framework.test import APITestCase
+from django.core.management import call_command
+from uuid import uuid4
+
+from ...models import *
+from ...pagination import encode_cursor
+from ...enrollment import enroll_users
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import User
+from django.test import override_settings
+from ...revocation import revocation_list
+
+
+class CourseDetailAPITests(APITestCase):
+    """
+    Test for public Course detail API endpoint
+    """
+
+    BASE_URL = "http://127.0.0.1:8000/api"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def add_learners_feedbacks_materials(self, course, count):
+        for i in range(count):
+            learner = User.objects.create_user(
+                username=f"learner{i}",
+                first_name="learner",
+                last_name=str(i),
+                password=f"learner{i}",
+            )
+            CourseTracker.objects.create(user=learner, course=course, profile="learner")
+            StudentFeedback.objects.create(
+                student=learner, course=course, feedback=f"feedback {i}"
+            )
+            CourseMaterial.objects.create(
+                title=f"chapter {i}",
+                content=f"content {i}",
+                duration=10,
+                course=course,
+            )
+
+    def test_get_course_detail_returns_200_with_enrolled_students_and_feedback(self):
+        """
+        Test get course detail returns enrolled students, feedback and materials
+        Test Pass criteria:
+            - Make a GET /api/courses/<course_id> for a course with 1 learner and 1 feedback
+            - Pass if response status code = 200 and response contains the learner and feedback
+        """
+        course = Course.objects.get(subcategory="stress_management")
+
+        response = self.client.get(self.BASE_URL + f"/courses/{course.id}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["author"], "Wesley Sanders")
+        self.assertEqual(response.data["author_username"], "wesley1980")
+        self.assertEqual(response.data["enrolled_student"][0]["username"], "bob1997")
+        self.assertEqual(response.data["enrolled_student"][0]["name"], "Bobby Taylor")
+        self.assertEqual(response.data["feedback_count"], 1)
+        self.assertEqual(response.data["feedback"][0]["student"], "Bobby Taylor")
+        self.assertEqual(len(response.data["course_material"]), 1)
+        self.assertFalse(response.data["course_material"][0]["hasFile"])
+
+    def test_get_course_detail_query_count_does_not_grow_with_course_size(self):
+        """
+        Test get course detail runs a fixed number of queries
+        Test Pass criteria:
+            - Add 20 learners, 20 feedbacks and 20 materials to a course
+            - Make a GET /api/courses/<course_id>
+            - Pass if the request runs within the query budget
+        """
+        course = Course.objects.get(subcategory="stress_management")
+        self.add_learners_feedbacks_materials(course, 20)
+
+        with self.assertNumQueries(4):
+            response = self.client.get(self.BASE_URL + f"/courses/{course.id}")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["enrolled_student"]), 21)
+        self.assertEqual(response.data["feedback_count"], 21)
+        self.assertEqual(len(response.data["course_material"]), 21)
+
+    def test_get_course_detail_with_unknown_course_id_returns_400_in_one_query(self):
+        """
+        Test get course detail with an unknown course id returns 400 BAD REQUEST
+        Test Pass criteria:
+            - Make a GET /api/courses/<course_id> with a course id that does not exist
+            - Pass if response status code = 400 and only one query is run
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.BASE_URL + f"/courses/{uuid4()}")
+
+        self.assertEqual(response.status_code, 400)
+
+
+class ListCoursesByCategoryAPITests(APITestCase):
+    """
+    Test for public list courses by category API endpoint
+    """
+
+    BASE_URL = "http://127.0.0.1:8000/api"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def test_list_courses_by_category_with_limit_returns_limited_courses_in_one_query(
+        self,
+    ):
+        """
+        Test list courses by category applies limit and resolves authors in one query
+        Test Pass criteria:
+            - Make a POST /api/courses/list-three-by-category with category = business, limit = 3
+            - Pass if 3 courses authored by Daniel West are returned using a single query
+        """
+        body = {"category": "business", "limit": 3}
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                self.BASE_URL + "/courses/list-three-by-category", body, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["category"], "business")
+        self.assertEqual(len(response.data["courses"]), 3)
+        for course in response.data["courses"]:
+            self.assertEqual(course["author"], "Daniel West")
+
+    def test_list_courses_by_category_cursor_pages_through_every_course(self):
+        """
+        Test list courses by category paginates with the `next` cursor
+        Test Pass criteria:
+            - Make a POST /api/courses/list-three-by-category with category = business, limit = 2
+            - Follow the `next` cursor until it is null
+            - Pass if pages contain 2, 2, 1 courses and every business course is returned once
+        """
+        url = self.BASE_URL + "/courses/list-three-by-category"
+        body = {"category": "business", "limit": 2}
+        page_sizes = []
+        course_ids = []
+
+        while True:
+            response = self.client.post(url, body, format="json")
+            self.assertEqual(response.status_code, 200)
+            page_sizes.append(len(response.data["courses"]))
+            course_ids += [course["id"] for course in response.data["courses"]]
+            if response.data["next"] is None:
+                break
+            body["cursor"] = response.data["next"]
+
+        self.assertEqual(page_sizes, [2, 2, 1])
+        self.assertCountEqual(
+            course_ids, Course.objects.filter(category="business").values_list("id", flat=True)
+        )
+
+    def test_list_courses_by_category_with_invalid_cursor_returns_400(self):
+        """
+        Test list courses by category with a malformed cursor returns 400 BAD REQUEST
+        """
+        for cursor in ["not-a-cursor", encode_cursor(["yesterday", "not-an-id"])]:
+            response = self.client.post(
+                self.BASE_URL + "/courses/list-three-by-category",
+                {"category": "business", "cursor": cursor},
+                format="json",
+            )
+
+            self.assertEqual(response.status_code, 400)
+
+    def test_list_top_courses_by_category_returns_every_category_in_one_query(self):
+        """
+        Test list top courses by category returns `limit` courses of every category
+        Test Pass criteria:
+            - Make a GET /api/courses/top-by-category?limit=2
+            - Pass if 2 courses are returned for each of the 3 categories using a single query
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.BASE_URL + "/courses/top-by-category", {"limit": 2}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [category["category"] for category in response.data],
+            ["business", "development", "personal_development"],
+        )
+        for category in response.data:
+            self.assertEqual(len(category["courses"]), 2)
+        self.assertEqual(response.data[1]["courses"][0]["author"], "Mark Jacob")
+
+    def test_get_list_courses_by_category_returns_cache_headers_and_304(self):
+        """
+        Test GET list courses by category is cacheable
+        Test Pass criteria:
+            - Make a GET /api/courses/list-three-by-category?category=business&limit=3
+            - Pass if response has ETag, public Cache-Control and Vary headers
+            - Repeat the request with If-None-Match = ETag
+            - Pass if response status code = 304
+        """
+        url = self.BASE_URL + "/courses/list-three-by-category"
+        params = {"category": "business", "limit": 3}
+
+        response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["courses"]), 3)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=", response["Cache-Control"])
+        self.assertIn("Accept", response["Vary"])
+
+        conditional_response = self.client.get(
+            url, params, headers={"If-None-Match": response["ETag"]}
+        )
+
+        self.assertEqual(conditional_response.status_code, 304)
+        self.assertEqual(conditional_response["ETag"], response["ETag"])
+
+    def test_author_name_change_is_reflected_in_course_listing(self):
+        """
+        Test renaming a course author updates the author shown in course listings
+        Test Pass criteria:
+            - Rename author daniel1980 to Dan West
+            - Make a POST /api/courses/list-three-by-category with category = business
+            - Pass if every course author is Dan West
+        """
+        author = User.objects.get(username="daniel1980")
+        author.first_name = "Dan"
+        author.save()
+
+        response = self.client.post(
+            self.BASE_URL + "/courses/list-three-by-category",
+            {"category": "business"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        for course in response.data["courses"]:
+            self.assertEqual(course["author"], "Dan West")
+
+
+# keep the token revocation filter from refreshing inside assertNumQueries
+@override_settings(TOKEN_REVOCATION_REFRESH_SECONDS=60 * 60)
+class ListCourseByUserAPITests(APITestCase):
+    """
+    Test for List courses by user API endpoint
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+
+    BASE_URL = "http://127.0.0.1:8000/api"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        revocation_list.refresh()
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def authenticate(self, username, password):
+        response = self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": username, "password": password},
+            format="json",
+        )
+
+        return {"Authorization": f"Bearer {response.data.get('access')}"}
+
+    def test_list_teacher_courses_with_counts_runs_one_query(self):
+        """
+        Test list courses of a teacher with counts
+        Test Pass criteria:
+            - Make a GET /api/users/courses/wesley1980?counts=true
+            - Pass if 5 authored courses are returned with learner and material counts
+            - Pass if courses and counts are fetched in a single query (plus authentication)
+        """
+        headers = self.authenticate("wesley1980", "wesley1980")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                self.BASE_URL + "/users/courses/wesley1980",
+                {"counts": "true"},
+                headers=headers,
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["courses"]), 5)
+        learner_counts = {
+            course["subcategory"]: course["learner_count"]
+            for course in response.data["courses"]
+        }
+        self.assertEqual(learner_counts["stress_management"], 1)
+        self.assertEqual(learner_counts["leadership"], 0)
+        for course in response.data["courses"]:
+            self.assertEqual(course["material_count"], 1)
+            self.assertEqual(course["author"], "Wesley Sanders")
+
+    def test_list_student_courses_filters_by_category(self):
+        """
+        Test list courses of a student filtered by category
+        Test Pass criteria:
+            - Make a GET /api/users/courses/bob1997 with category = personal_development, then business
+            - Pass if the enrolled course is returned only for personal_development
+        """
+        headers = self.authenticate("bob1997", "bob1997")
+        url = self.BASE_URL + "/users/courses/bob1997"
+
+        response = self.client.get(
+            url, {"category": "personal_development"}, headers=headers
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["courses"]), 1)
+        self.assertEqual(response.data["courses"][0]["author"], "Wesley Sanders")
+        self.assertNotIn("learner_count", response.data["courses"][0])
+
+        response = self.client.get(url, {"category": "business"}, headers=headers)
+        self.assertEqual(response.data["courses"], [])
+
+
+# keep the token revocation filter from refreshing inside assertNumQueries
+@override_settings(TOKEN_REVOCATION_REFRESH_SECONDS=60 * 60)
+class BulkEnrollCourseAPITests(APITestCase):
+    """
+    Test for Bulk Enroll users in course API endpoint
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+
+    BASE_URL = "http://127.0.0.1:8000/api/courses"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        revocation_list.refresh()
+        self.course = Course.objects.get(subcategory="stress_management")
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def authenticate(self, username, password):
+        response = self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": username, "password": password},
+            format="json",
+        )
+
+        return {"Authorization": f"Bearer {response.data.get('access')}"}
+
+    def enroll(self, username, student_usernames, course_id=None):
+        return self.client.post(
+            f"{self.BASE_URL}/{course_id or self.course.id}/students",
+            {"username": username, "studentUsernames": student_usernames},
+            format="json",
+            headers=self.authenticate(username, username),
+        )
+
+    def test_bulk_enroll_returns_per_user_summary(self):
+        """
+        Test bulk enroll enrolls new users and skips existing enrollments
+        Test Pass criteria:
+            - Make a POST /api/courses/<id>/students as the author (wesley1980)
+              with john1998, bob1997 (enrolled), wesley1980 (author), ghost (unknown)
+            - Pass if response status code = 200 and only john1998 is enrolled
+        """
+        response = self.enroll(
+            "wesley1980", ["john1998", "bob1997", "wesley1980", "ghost", "john1998"]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["enrolled"], 1)
+        self.assertListEqual(
+            [(result["username"], result["status"]) for result in response.data["results"]],
+            [
+                ("john1998", "enrolled"),
+                ("bob1997", "already_enrolled"),
+                ("wesley1980", "already_enrolled"),
+                ("ghost", "not_found"),
+            ],
+        )
+        self.assertEqual(
+            CourseTracker.objects.filter(course=self.course, profile="learner").count(), 2
+        )
+
+    def test_bulk_enroll_runs_fixed_number_of_queries(self):
+        """
+        Test bulk enroll does not query per user
+        Test Pass criteria:
+            - Make a POST /api/courses/<id>/students with 200 users (199 new)
+            - Pass if the request runs 8 queries (authentication, course, users,
+              enrollments, 2 batches of 100 inserts, savepoint and its release)
+        """
+        User.objects.bulk_create(
+            User(username=f"learner{i}", email=f"learner{i}@gmail.com")
+            for i in range(200)
+        )
+        headers = self.authenticate("wesley1980", "wesley1980")
+        usernames = [f"learner{i}" for i in range(200)]
+
+        self.client.post(
+            f"{self.BASE_URL}/{self.course.id}/students",
+            {"username": "wesley1980", "studentUsernames": usernames[:1]},
+            format="json",
+            headers=headers,
+        )
+        with self.settings(ENROLLMENT_BATCH_SIZE=100), self.assertNumQueries(8):
+            response = self.client.post(
+                f"{self.BASE_URL}/{self.course.id}/students",
+                {"username": "wesley1980", "studentUsernames": usernames},
+                format="json",
+                headers=headers,
+            )
+
+        self.assertEqual(response.data["enrolled"], 199)
+
+    def test_bulk_enroll_by_non_author_returns_403(self):
+        """
+        Test bulk enroll is restricted to the author of the course
+        Test Pass criteria:
+            - Make a POST /api/courses/<id>/students as daniel1980
+            - Pass if response status code = 403
+        """
+        response = self.enroll("daniel1980", ["john1998"])
+
+        self.assertEqual(response.status_code, 403)
+
+
+class BulkUpdateCourseUserBlockStatusAPITests(APITestCase):
+    """
+    Test for Block or unblock many learners of a course API endpoint
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+
+    BASE_URL = "http://127.0.0.1:8000/api/courses"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        # bob1997 is enrolled by seed_db, john1998 enrolls after him
+        self.course = Course.objects.get(subcategory="stress_management")
+        enroll_users(self.course, ["john1998"])
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def authenticate(self, username, password):
+        response = self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": username, "password": password},
+            format="json",
+        )
+
+        return {"Authorization": f"Bearer {response.data.get('access')}"}
+
+    def update_block_status(self, username, payload):
+        return self.client.patch(
+            f"{self.BASE_URL}/{self.course.id}/students/block-status",
+            {"username": username, **payload},
+            format="json",
+            headers=self.authenticate(username, username),
+        )
+
+    def test_block_students_by_id_returns_affected_learners(self):
+        """
+        Test block learners by id only returns learners whose status changed
+        Test Pass criteria:
+            - Make a PATCH /api/courses/<id>/students/block-status with bob1997, john1998
+              twice
+            - Pass if both learners are returned the first time and none the second time
+        """
+        student_ids = list(
+            User.objects.filter(username__in=["bob1997", "john1998"]).values_list(
+                "id", flat=True
+            )
+        )
+        payload = {"isBlocked": True, "studentIds": student_ids}
+
+        first = self.update_block_status("wesley1980", payload)
+        second = self.update_block_status("wesley1980", payload)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertCountEqual(
+            [learner["username"] for learner in first.data["learners"]],
+            ["bob1997", "john1998"],
+        )
+        self.assertEqual(second.data["updated"], 0)
+        self.assertEqual(
+            CourseTracker.objects.filter(course=self.course, is_blocked=True).count(), 2
+        )
+
+    def test_block_students_enrolled_after_runs_one_update(self):
+        """
+        Test block learners enrolled after a time with a single UPDATE
+        Test Pass criteria:
+            - Make a PATCH /api/courses/<id>/students/block-status with enrolledAfter set
+              to the enrollment time of bob1997
+            - Pass if only john1998 is blocked and returned by one UPDATE statement
+        """
+        enrolled_at = CourseTracker.objects.get(
+            course=self.course, user__username="bob1997"
+        ).created_at
+        headers = self.authenticate("wesley1980", "wesley1980")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f"{self.BASE_URL}/{self.course.id}/students/block-status",
+                {
+                    "username": "wesley1980",
+                    "isBlocked": True,
+                    "enrolledAfter": enrolled_at.isoformat(),
+                },
+                format="json",
+                headers=headers,
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertListEqual(
+            [learner["username"] for learner in response.data["learners"]], ["john1998"]
+        )
+        tracker_queries = [q for q in queries if "api_coursetracker" in q["sql"]]
+        self.assertEqual(len(tracker_queries), 1)
+        self.assertTrue(tracker_queries[0]["sql"].startswith("UPDATE"))
+
+    def test_block_students_without_selection_returns_400(self):
+        """
+        Test block learners requires studentIds or enrolledAfter
+        Test Pass criteria:
+            - Make a PATCH /api/courses/<id>/students/block-status with only isBlocked
+            - Pass if response status code = 400
+        """
+        response = self.update_block_status("wesley1980", {"isBlocked": True})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_block_students_by_non_author_returns_403(self):
+        """
+        Test block learners is restricted to the author of the course
+        Test Pass criteria:
+            - Make a PATCH /api/courses/<id>/students/block-status as daniel1980
+            - Pass if response status code = 403 and no learner is blocked
+        """
+        response = self.update_block_status(
+            "daniel1980", {"isBlocked": True, "enrolledAfter": "2000-01-01T00:00:00Z"}
+        )
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(CourseTracker.objects.filter(is_blocked=True).exists())
@@ -8,7 +8,8 @@ from django.contrib.auth.models import User
 from django.db.utils import IntegrityError
 from uuid import uuid4
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
 
 
 class CourseModelTests(TestCase):
@@ -101,3 +102,71 @@ class CourseModelTests(TestCase):
                     course=created_course,
                     feedback="This is a good course!",
                 )
+
+
+class CourseAuthorSyncTests(TestCase):
+    """
+    Test the denormalized author columns of Course follow its author CourseTracker row
+    and its author's User row
+    """
+
+    def setUp(self) -> None:
+        self.author = User.objects.create_user(
+            username="test123", first_name="test", last_name="123"
+        )
+        self.course = Course.objects.create(
+            name="101 ways to make million dollars in a year",
+            category="business",
+            subcategory="entrepreneurship",
+            description="Become a millionaire",
+        )
+
+    def test_author_tracker_saved_or_deleted_outside_views_syncs_author_columns(self):
+        """
+        Test creating then deleting an author CourseTracker row (eg: from the admin)
+        Test Pass criteria:
+            - Pass if the course author columns are set after the row is created
+            - Pass if they are cleared after the row is deleted
+        """
+        tracker = CourseTracker.objects.create(
+            user=self.author, course_id=self.course.id, profile="author"
+        )
+        self.course.refresh_from_db()
+        actual_author = (
+            self.course.author_id,
+            self.course.author_username,
+            self.course.author_name,
+        )
+
+        tracker.delete()
+        self.course.refresh_from_db()
+
+        self.assertEqual(actual_author, (self.author.id, "test123", "test 123"))
+        self.assertEqual(
+            (self.course.author_id, self.course.author_username), (None, "")
+        )
+
+    def test_user_save_without_author_changes_skips_course_update(self):
+        """
+        Test saving an author whose username and name did not change
+        Test Pass criteria:
+            - Load the author, change its password and save it
+            - Pass if the course table is not updated
+            - Rename the author and save it again
+            - Pass if the course author name is updated
+        """
+        CourseTracker.objects.create(
+            user=self.author, course=self.course, profile="author"
+        )
+        author = User.objects.get(pk=self.author.pk)
+        author.set_password("new password")
+
+        with CaptureQueriesContext(connection) as queries:
+            author.save()
+
+        author.first_name = "Dan"
+        author.save()
+        self.course.refresh_from_db()
+
+        self.assertFalse(any("api_course" in q["sql"] for q in queries))
+        self.assertEqual(self.course.author_name, "Dan 123")
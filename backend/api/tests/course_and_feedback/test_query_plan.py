@@ -0,0 +1,69 @@
+"""
+Test hot Course, CourseTracker, StudentFeedback and User queries use their indexes
+"""
+
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+from ...models import *
+from django.contrib.auth.models import User
+from django.db.models.functions import Lower
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN output is checked for sqlite")
+class QueryPlanTests(TestCase):
+    """
+    Test EXPLAIN output of hot queries searches an index instead of scanning the table
+    """
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(f"USING INDEX {index_name}", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_course_learners_lookup_uses_course_profile_index(self):
+        course = Course.objects.first()
+        self.assertUsesIndex(
+            CourseTracker.objects.filter(course_id=course.id, profile="learner"),
+            "tracker_course_profile_idx",
+        )
+
+    def test_user_recent_courses_lookup_uses_user_recent_index(self):
+        self.assertUsesIndex(
+            CourseTracker.objects.filter(
+                user__username="bob1997", profile="learner"
+            ).order_by("-created_at"),
+            "tracker_user_recent_idx",
+        )
+
+    def test_course_feedback_lookup_uses_course_date_index(self):
+        course = Course.objects.first()
+        self.assertUsesIndex(
+            StudentFeedback.objects.filter(course_id=course.id).order_by("created_at"),
+            "feedback_course_date_idx",
+        )
+
+    def test_category_listing_uses_category_recent_index(self):
+        self.assertUsesIndex(
+            Course.objects.filter(category="business").order_by("created_at", "id")[
+                :3
+            ],
+            "course_category_recent_idx",
+        )
+
+    def test_registration_email_lookup_uses_lower_email_index(self):
+        self.assertUsesIndex(
+            User.objects.annotate(email_lower=Lower("email")).filter(
+                email_lower="bob1997@gmail.com", email__gt=""
+            ),
+            "auth_user_email_lower_uniq",
+        )
@@ -0,0 +1,649 @@
+"""
+Test Course Material APIs
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from ...models import Course, CourseMaterial, UploadSession
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, DOWNLOAD_CHUNK_SIZE=1024)
+class DownloadCourseMaterialAttachmentAPITests(APITestCase):
+    """
+    Test for Download course material attachment API endpoint
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+
+    BASE_URL = "http://127.0.0.1:8000/api/courses/materials/download"
+
+    attachment = b"%PDF-1.4 course notes\n" * 1000
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        self.material = CourseMaterial.objects.create(
+            title="notes",
+            content="Course notes",
+            duration=10,
+            course=Course.objects.first(),
+        )
+        self.material.upload.save("notes.pdf", ContentFile(self.attachment))
+
+        access_token = self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": "bob1997", "password": "bob1997"},
+            format="json",
+        ).data.get("access")
+        self.headers = {"Authorization": f"Bearer {access_token}"}
+
+    def tearDown(self) -> None:
+        self.material.upload.delete(save=False)
+        call_command("clear_db")
+
+    def download(self, material_id):
+        return self.client.post(
+            self.BASE_URL,
+            {"authenticatedUsername": "bob1997", "materialId": str(material_id)},
+            format="json",
+            headers=self.headers,
+        )
+
+    def download_range(self, range_header, if_range=None):
+        headers = {**self.headers, "Range": range_header}
+        if if_range:
+            headers["If-Range"] = if_range
+
+        return self.client.get(
+            self.BASE_URL,
+            {"authenticatedUsername": "bob1997", "materialId": str(self.material.id)},
+            headers=headers,
+        )
+
+    def test_download_attachment_is_streamed_in_chunks(self):
+        """
+        Test download course material attachment streams the file
+        Test Pass criteria:
+            - Make a POST /api/courses/materials/download for a 22KB pdf
+            - Pass if the response is streamed in 1KB chunks with the file content
+            - Pass if Content-Length, Content-Type and Content-Disposition describe the file
+            - Pass if the file is closed once the response is closed
+        """
+        opened_files = []
+        storage_open = default_storage.open
+
+        def open_attachment(name, mode):
+            opened_files.append(storage_open(name, mode))
+            return opened_files[-1]
+
+        with mock.patch.object(default_storage, "open", side_effect=open_attachment):
+            response = self.download(self.material.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Length"], str(len(self.attachment)))
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="notes.pdf"'
+        )
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(response["ETag"], self.material.upload_etag)
+
+        chunks = list(response.streaming_content)
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+        self.assertEqual(b"".join(chunks), self.attachment)
+
+        response.close()
+        self.assertTrue(opened_files[0].closed)
+
+    def test_download_material_without_attachment_returns_404(self):
+        """
+        Test download course material without attachment returns 404
+        Test Pass criteria:
+            - Make a POST /api/courses/materials/download for a material without upload
+            - Pass if response status code = 404
+        """
+        material = CourseMaterial.objects.exclude(id=self.material.id).first()
+
+        response = self.download(material.id)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_with_invalid_material_id_returns_400(self):
+        """
+        Test download with a materialId that is not a UUID returns 400
+        Test Pass criteria:
+            - Make a POST /api/courses/materials/download with materialId = "1 OR 1=1"
+            - Pass if response status code = 400
+        """
+        response = self.download("1 OR 1=1")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_download_range_returns_206_with_partial_content(self):
+        """
+        Test download with Range returns the requested bytes
+        Test Pass criteria:
+            - Make GET /api/courses/materials/download with Range = bytes=100-1999,
+              bytes=21000- and bytes=-500
+            - Pass if each response status code = 206 with matching Content-Range,
+              Content-Length and content
+        """
+        size = len(self.attachment)
+        expected_ranges = {
+            "bytes=100-1999": (100, 1999),
+            "bytes=21000-": (21000, size - 1),
+            "bytes=-500": (size - 500, size - 1),
+        }
+
+        for range_header, (first, last) in expected_ranges.items():
+            with self.subTest(range_header):
+                response = self.download_range(range_header)
+
+                self.assertEqual(response.status_code, 206)
+                self.assertEqual(response["Content-Range"], f"bytes {first}-{last}/{size}")
+                self.assertEqual(response["Content-Length"], str(last - first + 1))
+                self.assertEqual(
+                    b"".join(response.streaming_content),
+                    self.attachment[first : last + 1],
+                )
+
+    def test_download_range_with_if_range(self):
+        """
+        Test download with If-Range only returns the range if the ETag still matches
+        Test Pass criteria:
+            - Make GET /api/courses/materials/download with Range and If-Range = ETag
+            - Replace the attachment and repeat the request with the old ETag
+            - Pass if response status codes = [206, 200] and the full new file is returned
+        """
+        etag = self.material.upload_etag
+
+        response = self.download_range("bytes=0-99", if_range=etag)
+        actual_responses = [response.status_code]
+
+        self.material.upload.save("notes.pdf", ContentFile(b"updated notes"))
+        self.assertNotEqual(self.material.upload_etag, etag)
+
+        response = self.download_range("bytes=0-99", if_range=etag)
+        actual_responses.append(response.status_code)
+
+        self.assertListEqual(actual_responses, [206, 200])
+        self.assertEqual(b"".join(response.streaming_content), b"updated notes")
+
+    def test_download_unsatisfiable_or_multiple_ranges_returns_416(self):
+        """
+        Test download rejects ranges outside the file and multiple ranges
+        Test Pass criteria:
+            - Make GET /api/courses/materials/download with Range past the end of the file
+              and with 2 ranges
+            - Pass if response status codes = 416 with Content-Range = bytes */size
+        """
+        size = len(self.attachment)
+
+        for range_header in (f"bytes={size}-", "bytes=0-99,200-299"):
+            with self.subTest(range_header):
+                response = self.download_range(range_header)
+
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response["Content-Range"], f"bytes */{size}")
+
+    @override_settings(DOWNLOAD_OFFLOAD="x-accel-redirect")
+    def test_download_offloaded_to_nginx_returns_x_accel_redirect(self):
+        """
+        Test download in x-accel-redirect mode hands the file to nginx
+        Test Pass criteria:
+            - Make a GET /api/courses/materials/download with a Range header
+            - Pass if response status code = 200 with an empty body, without opening
+              the file, and X-Accel-Redirect points to the internal media location
+        """
+        with mock.patch.object(default_storage, "open") as storage_open:
+            response = self.download_range("bytes=0-99")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b"")
+        storage_open.assert_not_called()
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected/media/{self.material.upload.name}"
+        )
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="notes.pdf"'
+        )
+        self.assertEqual(response["ETag"], self.material.upload_etag)
+
+    @override_settings(DOWNLOAD_OFFLOAD="x-sendfile")
+    def test_download_offloaded_to_apache_returns_x_sendfile(self):
+        """
+        Test download in x-sendfile mode hands the file path to the web server
+        Test Pass criteria:
+            - Make a POST /api/courses/materials/download
+            - Pass if X-Sendfile is the absolute path of the attachment
+        """
+        response = self.download(self.material.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response["X-Sendfile"], os.path.join(MEDIA_ROOT, self.material.upload.name)
+        )
+        self.assertNotIn("X-Accel-Redirect", response)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT)
+class SignedDownloadCourseMaterialAttachmentAPITests(APITestCase):
+    """
+    Test for signed course material download URL API endpoints
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+
+    BASE_URL = "http://127.0.0.1:8000/api/courses/materials"
+
+    attachment = b"%PDF-1.4 course notes\n" * 100
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        self.material = CourseMaterial.objects.create(
+            title="notes",
+            content="Course notes",
+            duration=10,
+            course=Course.objects.first(),
+        )
+        self.material.upload.save("notes.pdf", ContentFile(self.attachment))
+
+        access_token = self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": "bob1997", "password": "bob1997"},
+            format="json",
+        ).data.get("access")
+        self.headers = {"Authorization": f"Bearer {access_token}"}
+
+    def tearDown(self) -> None:
+        self.material.upload.delete(save=False)
+        call_command("clear_db")
+
+    def create_signed_url(self, material_id):
+        return self.client.post(
+            f"{self.BASE_URL}/{material_id}/signed-url",
+            {"authenticatedUsername": "bob1997"},
+            format="json",
+            headers=self.headers,
+        )
+
+    def test_signed_url_downloads_without_token_or_query(self):
+        """
+        Test a signed URL serves the attachment without authentication
+        Test Pass criteria:
+            - Make a POST /api/courses/materials/<material_id>/signed-url
+            - Make a GET on the returned url without an Authorization header
+            - Pass if response status codes = [201, 200] with the file content
+            - Pass if the download runs no database query
+            - Pass if the response is publicly cacheable until the URL expires
+        """
+        response = self.create_signed_url(self.material.id)
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("expiresAt", response.data)
+
+        with self.assertNumQueries(0):
+            download = self.client.get(response.data["url"])
+
+        self.assertEqual(download.status_code, 200)
+        self.assertEqual(b"".join(download.streaming_content), self.attachment)
+        self.assertEqual(download["ETag"], self.material.upload_etag)
+        self.assertIn("public", download["Cache-Control"])
+        max_age = int(download["Cache-Control"].split("max-age=")[1].split(",")[0])
+        self.assertTrue(0 < max_age <= 300)
+
+    def test_signed_url_is_served_by_any_worker_without_query(self):
+        """
+        Test a signed URL does not depend on state of the worker that created it
+        Test Pass criteria:
+            - Make a POST /api/courses/materials/<material_id>/signed-url
+            - Clear the cache (eg: another worker, or a restart) and GET the url
+            - Pass if response status code = 200 without any database query
+        """
+        url = self.create_signed_url(self.material.id).data["url"]
+        cache.clear()
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.attachment)
+
+    def test_signed_url_with_if_none_match_returns_304(self):
+        """
+        Test a signed URL revalidated with its ETag is not sent again
+        Test Pass criteria:
+            - Make a GET on a signed url with If-None-Match = ETag of the attachment
+            - Pass if response status code = 304
+        """
+        url = self.create_signed_url(self.material.id).data["url"]
+
+        response = self.client.get(
+            url, headers={"If-None-Match": self.material.upload_etag}
+        )
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], self.material.upload_etag)
+
+    def test_tampered_or_expired_signed_url_returns_403(self):
+        """
+        Test a modified or expired signed URL is rejected
+        Test Pass criteria:
+            - Make a GET on a signed url with one character changed
+            - Make a GET on a signed url after it has expired
+            - Pass if response status codes = [403, 403]
+        """
+        url = self.create_signed_url(self.material.id).data["url"]
+        tampered_url = url[:-1] + ("A" if url[-1] != "A" else "B")
+
+        actual_responses = [self.client.get(tampered_url).status_code]
+
+        with mock.patch("api.signed_urls.time.time", return_value=time.time() + 301):
+            actual_responses.append(self.client.get(url).status_code)
+
+        self.assertListEqual(actual_responses, [403, 403])
+
+    def test_signed_url_for_material_without_attachment_returns_404(self):
+        """
+        Test creating a signed URL for a material without upload returns 404
+        Test Pass criteria:
+            - Make a POST /api/courses/materials/<material_id>/signed-url
+            - Pass if response status code = 404
+        """
+        material = CourseMaterial.objects.exclude(id=self.material.id).first()
+
+        response = self.create_signed_url(material.id)
+
+        self.assertEqual(response.status_code, 404)
+
+
+UPLOAD_DIR = tempfile.mkdtemp()
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    CHUNKED_UPLOAD_DIR=UPLOAD_DIR,
+    CHUNKED_UPLOAD_PART_MAX_SIZE=4096,
+)
+class ChunkedCourseMaterialUploadAPITests(APITestCase):
+    """
+    Test for chunked course material upload API endpoints
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+
+    BASE_URL = "http://127.0.0.1:8000/api/courses/materials/uploads"
+
+    parts = [os.urandom(4096), os.urandom(4096), os.urandom(1000)]
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        shutil.rmtree(UPLOAD_DIR, ignore_errors=True)
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        self.course = Course.objects.get(subcategory="stress_management")
+        self.headers = self.auth_headers("wesley1980")
+
+        response = self.initiate("wesley1980")
+        self.assertEqual(response.status_code, 201)
+        self.upload_id = response.data["uploadId"]
+
+    def tearDown(self) -> None:
+        for material in CourseMaterial.objects.exclude(upload=""):
+            material.upload.delete(save=False)
+        call_command("clear_db")
+
+    def auth_headers(self, username):
+        access_token = self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": username, "password": username},
+            format="json",
+        ).data.get("access")
+        return {"Authorization": f"Bearer {access_token}"}
+
+    def initiate(self, username):
+        return self.client.post(
+            f"http://127.0.0.1:8000/api/courses/{self.course.id}/course-material/uploads",
+            {
+                "authenticatedUsername": username,
+                "title": "lecture",
+                "content": "Lecture video",
+                "duration": 90,
+                "filename": "lecture.mp4",
+            },
+            format="json",
+            headers=self.headers,
+        )
+
+    @staticmethod
+    def checksum(content):
+        return hashlib.sha256(content).hexdigest()
+
+    def upload_part(self, number, content, checksum=None):
+        return self.client.put(
+            f"{self.BASE_URL}/{self.upload_id}/parts/{number}"
+            "?authenticatedUsername=wesley1980",
+            content,
+            content_type="application/octet-stream",
+            headers={
+                **self.headers,
+                "X-Checksum-SHA256": checksum or self.checksum(content),
+            },
+        )
+
+    def complete(self, parts):
+        return self.client.post(
+            f"{self.BASE_URL}/{self.upload_id}/complete",
+            {
+                "authenticatedUsername": "wesley1980",
+                "parts": [
+                    {"partNumber": number, "checksum": self.checksum(content)}
+                    for number, content in parts
+                ],
+            },
+            format="json",
+            headers=self.headers,
+        )
+
+    def test_chunked_upload_creates_course_material(self):
+        """
+        Test chunked upload assembles the parts into a new course material
+        Test Pass criteria:
+            - Initiate an upload, PUT 3 parts out of order and complete it
+            - Pass if response status codes = [200, 200, 200, 201]
+            - Pass if the material upload is the concatenation of the parts, with
+              the ETag of the whole file computed while copying the parts
+            - Pass if the upload session and its staged parts are deleted
+        """
+        actual_responses = [
+            self.upload_part(number, self.parts[number - 1]).status_code
+            for number in (2, 3, 1)
+        ]
+
+        with mock.patch("api.models.file_etag") as file_etag:
+            response = self.complete(enumerate(self.parts, start=1))
+        actual_responses.append(response.status_code)
+        file_etag.assert_not_called()
+
+        self.assertListEqual(actual_responses, [200, 200, 200, 201])
+        material = CourseMaterial.objects.get(id=response.data["materialId"])
+        content = b"".join(self.parts)
+        with material.upload.open("rb") as file:
+            self.assertEqual(file.read(), content)
+        self.assertEqual(material.upload_etag, f'"{self.checksum(content)}"')
+        self.assertEqual(material.course_id, self.course.id)
+        self.assertEqual(material.duration, 90)
+        self.assertFalse(UploadSession.objects.exists())
+        self.assertFalse(
+            os.path.exists(os.path.join(UPLOAD_DIR, str(self.upload_id)))
+        )
+
+    def test_upload_part_with_wrong_checksum_is_discarded(self):
+        """
+        Test a part whose checksum does not match is rejected and can be sent again
+        Test Pass criteria:
+            - PUT part 1 with the checksum of other content, then with its checksum
+            - GET the upload session to resume it
+            - Pass if response status codes = [400, 200] and only the second copy is listed
+        """
+        actual_responses = [
+            self.upload_part(1, self.parts[0], self.checksum(b"other")).status_code,
+            self.upload_part(1, self.parts[0]).status_code,
+        ]
+
+        response = self.client.get(
+            f"{self.BASE_URL}/{self.upload_id}?authenticatedUsername=wesley1980",
+            headers=self.headers,
+        )
+
+        self.assertListEqual(actual_responses, [400, 200])
+        self.assertListEqual(
+            response.data["parts"],
+            [{"partNumber": 1, "size": 4096, "checksum": self.checksum(self.parts[0])}],
+        )
+
+    def test_upload_part_larger_than_max_size_returns_413(self):
+        """
+        Test a part larger than CHUNKED_UPLOAD_PART_MAX_SIZE is rejected
+        Test Pass criteria:
+            - PUT a part of 4097 bytes
+            - Pass if response status code = 413 and no part is recorded
+        """
+        response = self.upload_part(1, os.urandom(4097))
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(UploadSession.objects.get(id=self.upload_id).parts.exists())
+
+    def test_upload_part_with_malformed_content_length_returns_400(self):
+        """
+        Test a part with a Content-Length that is not a number is rejected
+        Test Pass criteria:
+            - PUT a part with Content-Length = "abc"
+            - Pass if response status code = 400
+        """
+        response = self.client.put(
+            f"{self.BASE_URL}/{self.upload_id}/parts/1"
+            "?authenticatedUsername=wesley1980",
+            self.parts[0],
+            content_type="application/octet-stream",
+            headers={**self.headers, "X-Checksum-SHA256": self.checksum(self.parts[0])},
+            CONTENT_LENGTH="abc",
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_complete_with_missing_or_mismatched_parts_returns_400(self):
+        """
+        Test completing an upload requires every part with matching checksums
+        Test Pass criteria:
+            - Upload parts 1 and 3, then complete with parts 1-3
+            - Complete with parts 1 and 3 only, and with a wrong content for part 1
+            - Pass if response status codes = [400, 400, 400] and no material is created
+        """
+        self.upload_part(1, self.parts[0])
+        self.upload_part(3, self.parts[2])
+
+        actual_responses = [
+            self.complete(enumerate(self.parts, start=1)).status_code,
+            self.complete([(1, self.parts[0]), (3, self.parts[2])]).status_code,
+            self.complete([(1, b"other")]).status_code,
+        ]
+
+        self.assertListEqual(actual_responses, [400, 400, 400])
+        self.assertFalse(CourseMaterial.objects.filter(title="lecture").exists())
+
+    def test_upload_session_of_other_user_returns_404(self):
+        """
+        Test an upload session is only visible to the user who started it
+        Test Pass criteria:
+            - PUT a part and GET the upload session as john1998
+            - Pass if response status codes = [404, 404]
+        """
+        self.headers = self.auth_headers("john1998")
+
+        actual_responses = [
+            self.client.put(
+                f"{self.BASE_URL}/{self.upload_id}/parts/1"
+                "?authenticatedUsername=john1998",
+                self.parts[0],
+                content_type="application/octet-stream",
+                headers={
+                    **self.headers,
+                    "X-Checksum-SHA256": self.checksum(self.parts[0]),
+                },
+            ).status_code,
+            self.client.get(
+                f"{self.BASE_URL}/{self.upload_id}?authenticatedUsername=john1998",
+                headers=self.headers,
+            ).status_code,
+        ]
+
+        self.assertListEqual(actual_responses, [404, 404])
+
+    def test_initiate_upload_with_invalid_filename_returns_400(self):
+        """
+        Test a chunked upload is rejected up front if the storage would refuse its name
+        Test Pass criteria:
+            - Initiate uploads with filename = "..", "." and "../lecture.mp4"
+            - Pass if response status codes = [400, 400, 400] and no session is created
+        """
+        actual_responses = []
+        for filename in ("..", ".", "../lecture.mp4"):
+            response = self.client.post(
+                f"http://127.0.0.1:8000/api/courses/{self.course.id}"
+                "/course-material/uploads",
+                {
+                    "authenticatedUsername": "wesley1980",
+                    "title": "lecture",
+                    "content": "Lecture video",
+                    "duration": 90,
+                    "filename": filename,
+                },
+                format="json",
+                headers=self.headers,
+            )
+            actual_responses.append(response.status_code)
+
+        self.assertListEqual(actual_responses, [400, 400, 400])
+        self.assertEqual(UploadSession.objects.count(), 1)
+
+    def test_initiate_upload_by_non_author_returns_403(self):
+        """
+        Test a chunked upload can only be started by the author of the course
+        Test Pass criteria:
+            - Initiate an upload as bob1997, a learner of the course
+            - Pass if response status code = 403 and no new upload session is created
+        """
+        self.headers = self.auth_headers("bob1997")
+
+        response = self.initiate("bob1997")
+
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(UploadSession.objects.count(), 1)
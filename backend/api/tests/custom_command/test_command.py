@@ -4,6 +4,13 @@ Test Custom management command
 
 from django.test import TestCase
 from django.core.management import call_command
+from io import StringIO
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.utils import timezone
 
 from ...models import *
 
@@ -27,3 +34,78 @@ class EventsAPITests(TestCase):
         num_courses = len(Course.objects.all())
         expect = [num_users, num_courses]
         self.assertEqual(expect, [5, 15])
+
+    def test_provision_users_creates_users_from_csv_file(self):
+        """
+        Test provision_users custom command creates users, hashing passwords in 2 processes
+        """
+        csv_file = (
+            "username,first_name,last_name,email,role,password,interest\n"
+            "amy2001,Amy,Lee,amy2001@gmail.com,student,amy2001,math\n"
+            "tom1985,Tom,Reed,tom1985@gmail.com,teacher,tom1985,\n"
+            "john1998,John,Park,john@gmail.com,student,john1998,\n"
+        )
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as file:
+            file.write(csv_file)
+        self.addCleanup(os.remove, file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command("provision_users", file.name, workers=2, stdout=out, stderr=err)
+
+        self.assertIn("Created 2 users, 1 rows failed", out.getvalue())
+        self.assertIn("Row 3 (john1998)", err.getvalue())
+        self.assertTrue(User.objects.get(username="tom1985").check_password("tom1985"))
+
+    def test_enroll_users_enrolls_users_from_file(self):
+        """
+        Test enroll_users custom command enrolls new users and skips existing ones
+        """
+        course = Course.objects.get(subcategory="stress_management")
+        with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as file:
+            file.write("john1998\nbob1997\n")
+        self.addCleanup(os.remove, file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command(
+            "enroll_users", str(course.id), "ghost", file=file.name, stdout=out, stderr=err
+        )
+
+        self.assertIn("Enrolled 1 users", out.getvalue())
+        self.assertIn("ghost: not_found", err.getvalue())
+        self.assertIn("bob1997: already_enrolled", err.getvalue())
+        self.assertTrue(
+            CourseTracker.objects.filter(course=course, user__username="john1998").exists()
+        )
+
+    def test_prune_upload_sessions_deletes_unfinished_uploads(self):
+        """
+        Test prune_upload_sessions custom command deletes old upload sessions and parts
+        """
+        upload_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, upload_dir, ignore_errors=True)
+        course = Course.objects.first()
+        sessions = [
+            UploadSession.objects.create(
+                user=course.author,
+                course=course,
+                filename="lecture.mp4",
+                title="lecture",
+                content="Lecture",
+                duration=60,
+            )
+            for _ in range(2)
+        ]
+        UploadSession.objects.filter(id=sessions[0].id).update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+        os.makedirs(os.path.join(upload_dir, str(sessions[0].id)))
+
+        out = StringIO()
+        with self.settings(CHUNKED_UPLOAD_DIR=upload_dir):
+            call_command("prune_upload_sessions", stdout=out)
+
+        self.assertIn("Deleted 1 unfinished upload sessions", out.getvalue())
+        self.assertListEqual(
+            list(UploadSession.objects.values_list("id", flat=True)), [sessions[1].id]
+        )
+        self.assertListEqual(os.listdir(upload_dir), [])
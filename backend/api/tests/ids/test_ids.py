@@ -0,0 +1,42 @@
+"""
+Test time-ordered identifiers
+"""
+
+import time
+
+from django.test import SimpleTestCase
+
+from ...ids import uuid7
+
+
+class UUID7Tests(SimpleTestCase):
+    """
+    Test for uuid7 identifier generator
+    """
+
+    def test_uuid7_sets_version_and_variant(self):
+        """
+        Test uuid7 returns a version 7, RFC 4122 variant UUID
+        """
+        generated = uuid7()
+
+        self.assertEqual(generated.version, 7)
+        self.assertEqual(generated.variant, "specified in RFC 4122")
+
+    def test_uuid7_is_strictly_increasing(self):
+        """
+        Test uuid7 values generated in a tight loop (same millisecond) keep increasing
+        """
+        generated = [uuid7() for _ in range(10000)]
+
+        self.assertEqual(generated, sorted(generated))
+        self.assertEqual(len(set(generated)), len(generated))
+
+    def test_uuid7_embeds_creation_time(self):
+        """
+        Test uuid7 embeds the current unix time in milliseconds in its first 48 bits
+        """
+        before = time.time_ns() // 1_000_000
+        generated = uuid7()
+
+        self.assertGreaterEqual(generated.int >> 80, before)
@@ -7,6 +7,8 @@ from rest_framework.test import RequestsClient, APITestCase
 from django.core.management import call_command
 from rest_framework import status
 from uuid import uuid4
+from unittest import mock
+import jwt
 
 
 from ...models import *
@@ -88,3 +90,50 @@ class StatusAPITests(APITestCase):
         )
 
         self.assertEqual(response.status_code, 401)
+
+    def test_authenticated_request_decodes_token_once(self):
+        """
+        Test authenticated API request verifies the bearer token only once
+        Test Pass criteria:
+            - Make a POST /api/users/status and provide bearer token and payload
+            - Pass if response status code = 200 and the token is decoded once
+        """
+        random_user = User.objects.first()
+        random_user_username = random_user.username
+
+        ACCESS_TOKEN = self.authenticate(random_user_username, random_user_username)
+
+        headers = {"Authorization": f"Bearer {ACCESS_TOKEN}"}
+
+        body = {"username": random_user_username}
+
+        with mock.patch(
+            "rest_framework_simplejwt.backends.jwt.decode", wraps=jwt.decode
+        ) as decode:
+            response = self.client.post(
+                self.BASE_URL + "/users/status", body, headers=headers, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(decode.call_count, 1)
+
+    def test_request_with_token_of_another_user_return_401(self):
+        """
+        Test API request for another user's username returns 401
+        Test Pass criteria:
+            - Make a PATCH /api/users/status with a bearer token of a different user
+            - Pass if response status code = 401
+        """
+        users = User.objects.all()[:2]
+
+        ACCESS_TOKEN = self.authenticate(users[0].username, users[0].username)
+
+        headers = {"Authorization": f"Bearer {ACCESS_TOKEN}"}
+
+        body = {"username": users[1].username, "status": "dnd"}
+
+        response = self.client.patch(
+            self.BASE_URL + "/users/status", body, headers=headers, format="json"
+        )
+
+        self.assertEqual(response.status_code, 401)
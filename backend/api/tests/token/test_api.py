@@ -13,6 +13,10 @@ import os
 
 from ...models import Role
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from ...revocation import revocation_list
 
 
 class SimpleJWTAPITests(APITestCase):
@@ -66,3 +70,208 @@ class SimpleJWTAPITests(APITestCase):
         decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
 
         self.assertEqual(decoded.get("role"), role)
+
+
+# keep the token revocation filter from refreshing inside assertNumQueries
+@override_settings(TOKEN_REVOCATION_REFRESH_SECONDS=60 * 60)
+class StatelessAuthenticationAPITests(APITestCase):
+    """
+    Test for read-only endpoints authenticated from token claims
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+
+    BASE_URL = "http://127.0.0.1:8000/api"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        revocation_list.refresh()
+        cache.clear()
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def authenticate(self, username, password):
+        response = self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": username, "password": password},
+            format="json",
+        )
+
+        return {"Authorization": f"Bearer {response.data.get('access')}"}
+
+    def test_stateless_request_skips_user_query_once_user_is_cached(self):
+        """
+        Test stateless authentication does not load the user on every request
+        Test Pass criteria:
+            - Make a GET /api/users/courses/bob1997 twice
+            - Pass if the second request only runs the course listing query
+        """
+        headers = self.authenticate("bob1997", "bob1997")
+        url = self.BASE_URL + "/users/courses/bob1997"
+
+        self.client.get(url, headers=headers)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, headers=headers)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_stateless_request_of_disabled_user_returns_401(self):
+        """
+        Test stateless authentication rejects a user disabled after the token was issued
+        Test Pass criteria:
+            - Make a GET /api/users/courses/bob1997
+            - Disable bob1997 and repeat the request with the same token
+            - Pass if response status codes = [200, 401]
+        """
+        headers = self.authenticate("bob1997", "bob1997")
+        url = self.BASE_URL + "/users/courses/bob1997"
+
+        actual_responses = [self.client.get(url, headers=headers).status_code]
+
+        user = User.objects.get(username="bob1997")
+        user.is_active = False
+        user.save()
+
+        actual_responses.append(self.client.get(url, headers=headers).status_code)
+
+        self.assertListEqual(actual_responses, [200, 401])
+
+
+class TokenRevocationAPITests(APITestCase):
+    """
+    Test for revoking access and refresh tokens
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+    REFRESH_TOKEN_URL = "http://127.0.0.1:8000/api/token/refresh/"
+    REVOKE_TOKEN_URL = "http://127.0.0.1:8000/api/token/revoke/"
+
+    BASE_URL = "http://127.0.0.1:8000/api"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        revocation_list.refresh()
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def get_tokens(self, username, password):
+        return self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": username, "password": password},
+            format="json",
+        ).data
+
+    def test_revoked_tokens_return_401(self):
+        """
+        Test revoked access and refresh tokens are rejected
+        Test Pass criteria:
+            - Make a POST /api/token/revoke/ with bob1997's tokens
+            - Make a GET /api/users/courses/bob1997 and a POST /api/token/refresh/
+            - Pass if response status codes = [205, 401, 401]
+        """
+        tokens = self.get_tokens("bob1997", "bob1997")
+        headers = {"Authorization": f"Bearer {tokens['access']}"}
+
+        actual_responses = [
+            self.client.post(
+                self.REVOKE_TOKEN_URL,
+                {"refresh": tokens["refresh"]},
+                format="json",
+                headers=headers,
+            ).status_code,
+            self.client.get(
+                self.BASE_URL + "/users/courses/bob1997", headers=headers
+            ).status_code,
+            self.client.post(
+                self.REFRESH_TOKEN_URL, {"refresh": tokens["refresh"]}, format="json"
+            ).status_code,
+        ]
+
+        self.assertListEqual(actual_responses, [205, 401, 401])
+
+    def test_revoked_tokens_are_rejected_after_filter_rebuild(self):
+        """
+        Test revocations are loaded from the database into a fresh filter
+        Test Pass criteria:
+            - Revoke bob1997's tokens and rebuild the filter from the database
+            - Pass if the access token is rejected
+        """
+        tokens = self.get_tokens("bob1997", "bob1997")
+        headers = {"Authorization": f"Bearer {tokens['access']}"}
+        self.client.post(
+            self.REVOKE_TOKEN_URL,
+            {"refresh": tokens["refresh"]},
+            format="json",
+            headers=headers,
+        )
+
+        revocation_list.refresh()
+        response = self.client.get(self.BASE_URL + "/users/courses/bob1997", headers=headers)
+
+        self.assertEqual(response.status_code, 401)
+
+    @override_settings(TOKEN_REVOCATION_REFRESH_SECONDS=0)
+    def test_incremental_refresh_counts_each_revoked_token_once(self):
+        """
+        Test re-reading recent revocations does not grow the filter count
+        Test Pass criteria:
+            - Revoke bob1997's tokens, then refresh the filter incrementally 5 times
+            - Pass if the filter still counts 2 revoked tokens (access and refresh)
+        """
+        tokens = self.get_tokens("bob1997", "bob1997")
+        self.client.post(
+            self.REVOKE_TOKEN_URL,
+            {"refresh": tokens["refresh"]},
+            format="json",
+            headers={"Authorization": f"Bearer {tokens['access']}"},
+        )
+
+        for _ in range(5):
+            revocation_list.is_revoked(str(uuid4()))
+
+        self.assertEqual(revocation_list._bloom.count, 2)
+
+    def test_unrevoked_token_skips_revocation_query(self):
+        """
+        Test a token missing from the revocation filter is not looked up in the database
+        Test Pass criteria:
+            - Revoke john1998's tokens, then refresh bob1997's token
+            - Pass if response status code = 200 and only the active user check queried
+        """
+        john = self.get_tokens("john1998", "john1998")
+        self.client.post(
+            self.REVOKE_TOKEN_URL,
+            {"refresh": john["refresh"]},
+            format="json",
+            headers={"Authorization": f"Bearer {john['access']}"},
+        )
+        bob = self.get_tokens("bob1997", "bob1997")
+
+        with self.assertNumQueries(1):
+            response = self.client.post(
+                self.REFRESH_TOKEN_URL, {"refresh": bob["refresh"]}, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_revoke_refresh_token_of_other_user_returns_400(self):
+        """
+        Test a user cannot revoke another user's refresh token
+        Test Pass criteria:
+            - Make a POST /api/token/revoke/ as bob1997 with john1998's refresh token
+            - Pass if response status code = 400
+        """
+        bob = self.get_tokens("bob1997", "bob1997")
+        john = self.get_tokens("john1998", "john1998")
+
+        response = self.client.post(
+            self.REVOKE_TOKEN_URL,
+            {"refresh": john["refresh"]},
+            format="json",
+            headers={"Authorization": f"Bearer {bob['access']}"},
+        )
+
+        self.assertEqual(response.status_code, 400)
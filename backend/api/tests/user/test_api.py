@@ -8,9 +8,13 @@ from django.core.management import call_command
 from django.db.utils import IntegrityError
 from rest_framework import status
 from uuid import uuid4
+import json
 
-from ...models import Role
+from ...models import Role, Course
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from ...revocation import revocation_list
 
 
 class RegisterUserAPITests(APITestCase):
@@ -121,6 +125,26 @@ class RegisterUserAPITests(APITestCase):
 
         self.assertListEqual(actual_responses, expected_responses)
 
+    def test_register_user_with_duplicate_email_in_other_case_returns_400(self):
+        """
+        Test register user with an email differing only in case returns 400 BAD REQUEST
+        Test Pass criteria:
+            - Make a POST /api/v1/register twice, upper casing the email the second time
+            - Pass if response status codes = [201, 400]
+        """
+        payload = {**self.valid_register_user_payload, "email": "case123@gmail.com"}
+
+        actual_responses = [
+            self.client.post(self.BASE_URL, payload, format="json").status_code
+        ]
+
+        payload.update(username="case321", email="Case123@GMAIL.com")
+        actual_responses.append(
+            self.client.post(self.BASE_URL, payload, format="json").status_code
+        )
+
+        self.assertListEqual(actual_responses, [201, 400])
+
     def test_register_user_with_invalid_role_returns_400(self):
         """
         Test register user with invalid role returns 400 BAD REQUEST
@@ -138,3 +162,226 @@ class RegisterUserAPITests(APITestCase):
         )
 
         self.assertEqual(response.status_code, 400)
+
+
+# keep the token revocation filter from refreshing inside assertNumQueries
+@override_settings(TOKEN_REVOCATION_REFRESH_SECONDS=60 * 60)
+class ListUsersAPITests(APITestCase):
+    """
+    Test for List Users API endpoint
+    """
+
+    GET_TOKEN_URL = "http://127.0.0.1:8000/api/token/"
+
+    BASE_URL = "http://127.0.0.1:8000/api/users"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        revocation_list.refresh()
+        access_token = self.client.post(
+            path=self.GET_TOKEN_URL,
+            data={"username": "bob1997", "password": "bob1997"},
+            format="json",
+        ).data.get("access")
+        self.headers = {"Authorization": f"Bearer {access_token}"}
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def test_list_users_returns_users_sorted_by_fullname_in_one_query(self):
+        """
+        Test list users returns every user sorted by full name
+        Test Pass criteria:
+            - Make a POST /api/users with a valid bearer token
+            - Pass if 5 users are returned sorted by full name
+            - Pass if users and roles are fetched in a single query (plus authentication)
+        """
+        with self.assertNumQueries(2):
+            response = self.client.post(
+                self.BASE_URL, {"username": "bob1997"}, headers=self.headers, format="json"
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [user["fullname"] for user in response.data],
+            ["Bobby Taylor", "Daniel West", "John Park", "Mark Jacob", "Wesley Sanders"],
+        )
+        self.assertEqual(response.data[0]["role"], "student")
+
+    def test_list_users_filters_by_role_and_paginates(self):
+        """
+        Test list users filters by role and paginates with the next cursor of the body
+        Test Pass criteria:
+            - Make a POST /api/users with role = teacher, limit = 2
+            - Repeat the request with cursor = next
+            - Pass if pages contain [Daniel West, Mark Jacob] then [Wesley Sanders]
+            - Pass if next is null on the last page
+        """
+        body = {"username": "bob1997", "role": "teacher", "limit": 2}
+
+        first_page = self.client.post(
+            self.BASE_URL, body, headers=self.headers, format="json"
+        )
+        body["cursor"] = first_page.data["next"]
+        second_page = self.client.post(
+            self.BASE_URL, body, headers=self.headers, format="json"
+        )
+
+        self.assertEqual(
+            [user["fullname"] for user in first_page.data["users"]],
+            ["Daniel West", "Mark Jacob"],
+        )
+        self.assertEqual(
+            [user["fullname"] for user in second_page.data["users"]], ["Wesley Sanders"]
+        )
+        self.assertIsNone(second_page.data["next"])
+
+
+class ListUserDetailAPITests(APITestCase):
+    """
+    Test for List User Detail API endpoint
+    """
+
+    BASE_URL = "http://127.0.0.1:8000/api/users"
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def test_get_user_detail_returns_recent_courses_in_fixed_queries(self):
+        """
+        Test get user detail returns the most recent courses using a fixed number of queries
+        Test Pass criteria:
+            - Make a GET /api/users/wesley1980 (teacher authoring 5 courses)
+            - Pass if response status code = 200 and the 4 most recent courses are returned
+            - Pass if the request runs 3 queries
+        """
+        authored_courses = list(
+            Course.objects.filter(author__username="wesley1980")
+            .order_by("created_at")
+            .values_list("name", flat=True)
+        )
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.BASE_URL + "/wesley1980")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["role"], "teacher")
+        self.assertEqual(response.data["status"], "active")
+        self.assertEqual(
+            [course["name"] for course in response.data["courses"]], authored_courses[1:]
+        )
+        self.assertEqual(response.data["courses"][0]["author"], "Wesley Sanders")
+
+    def test_get_student_detail_returns_interests_and_enrolled_courses(self):
+        """
+        Test get user detail of a student returns interests and enrolled courses
+        """
+        response = self.client.get(self.BASE_URL + "/bob1997")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            response.data["interests"],
+            [{"interest": "business"}, {"interest": "development"}],
+        )
+        self.assertEqual(len(response.data["courses"]), 1)
+
+
+class BulkCreateUserAPITests(APITestCase):
+    """
+    Test for Bulk Register Users API endpoint
+    """
+
+    BASE_URL = "http://127.0.0.1:8000/api/user/register/bulk/"
+
+    csv_file = (
+        "username,first_name,last_name,email,role,password,interest\n"
+        "amy2001,Amy,Lee,amy2001@gmail.com,student,amy2001,math;data_analysis\n"
+        "tom1985,Tom,Reed,tom1985@gmail.com,teacher,tom1985,\n"
+        "bob2000,Bob,Stone,BOB97@gmail.com,student,bob2000,\n"
+        "sam1990,Sam,Hill,sam1990@gmail.com,parent,sam1990,\n"
+    )
+
+    def setUp(self) -> None:
+        call_command("seed_db")
+        admin = User.objects.create_superuser("admin", "admin@gmail.com", "admin")
+        self.client.force_authenticate(user=admin)
+
+    def tearDown(self) -> None:
+        call_command("clear_db")
+
+    def upload(self, name, content):
+        return self.client.post(
+            self.BASE_URL,
+            {"file": SimpleUploadedFile(name, content.encode())},
+            format="multipart",
+        )
+
+    def test_bulk_register_csv_creates_valid_rows_and_reports_errors(self):
+        """
+        Test bulk register creates the valid users of a CSV file
+        Test Pass criteria:
+            - Make a POST /api/user/register/bulk/ with 4 users, 2 of them invalid
+            - Pass if response status code = 201 and amy2001, tom1985 are created
+            - Pass if rows 3 (email taken by bob1997) and 4 (invalid role) are reported
+            - Pass if roles, statuses, interests and passwords are stored
+        """
+        response = self.upload("cohort.csv", self.csv_file)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertListEqual(response.data["created"], ["amy2001", "tom1985"])
+        self.assertListEqual(
+            [(error["row"], list(error["errors"])) for error in response.data["errors"]],
+            [(3, ["email"]), (4, ["role"])],
+        )
+
+        amy = User.objects.get(username="amy2001")
+        self.assertTrue(amy.check_password("amy2001"))
+        self.assertEqual(amy.userRole.role, "student")
+        self.assertEqual(amy.userStatus.get().status, "active")
+        self.assertCountEqual(
+            amy.studentInterest.values_list("interest", flat=True),
+            ["math", "data_analysis"],
+        )
+        self.assertEqual(User.objects.get(username="tom1985").userRole.role, "teacher")
+
+    def test_bulk_register_jsonl_rejects_duplicates_within_file(self):
+        """
+        Test bulk register rejects a username repeated within the file
+        Test Pass criteria:
+            - Make a POST /api/user/register/bulk/ with a JSONL file listing amy2001 twice
+            - Pass if only the first record is created and row 2 is reported
+        """
+        record = {
+            "username": "amy2001",
+            "first_name": "Amy",
+            "last_name": "Lee",
+            "email": "amy2001@gmail.com",
+            "role": "student",
+            "password": "amy2001",
+            "interest": [{"interest": "math"}],
+        }
+        second = {**record, "email": "amy.lee@gmail.com"}
+        content = "\n".join(json.dumps(r) for r in (record, second)) + "\n"
+
+        response = self.upload("cohort.jsonl", content)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertListEqual(response.data["created"], ["amy2001"])
+        self.assertEqual(response.data["errors"][0]["row"], 2)
+        self.assertIn("username", response.data["errors"][0]["errors"])
+
+    def test_bulk_register_by_non_admin_returns_403(self):
+        """
+        Test bulk register is restricted to admin users
+        Test Pass criteria:
+            - Make a POST /api/user/register/bulk/ authenticated as bob1997
+            - Pass if response status code = 403
+        """
+        self.client.force_authenticate(user=User.objects.get(username="bob1997"))
+
+        response = self.upload("cohort.csv", self.csv_file)
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,212 @@
+"""
+Chunked, resumable course material uploads
+
+A large attachment is sent in numbered parts instead of one multipart request:
+
+    1. initiate  - create an `UploadSession` holding the course material fields
+    2. parts     - PUT each part (any order, retried parts replace the previous copy)
+                   with the sha256 of its content in the X-Checksum-SHA256 header
+    3. complete  - concatenate parts 1..N into `CourseMaterial.upload`
+
+Parts are streamed from the request to CHUNKED_UPLOAD_DIR in CHUNK_SIZE blocks and
+hashed on the way, so neither a part nor the whole file is held in memory. A part whose
+checksum does not match is discarded. Since received parts are recorded as
+`UploadPart` rows, an interrupted upload resumes by sending the missing parts only.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+
+from .models import CourseMaterial, UploadPart, UploadSession
+
+CHUNK_SIZE = 64 * 1024
+
+CHECKSUM_HEADER = "X-Checksum-SHA256"
+
+
+class UploadError(Exception):
+    pass
+
+
+class PartTooLarge(UploadError):
+    pass
+
+
+class ChecksumMismatch(UploadError):
+    pass
+
+
+def session_dir(session: UploadSession) -> str:
+    return os.path.join(settings.CHUNKED_UPLOAD_DIR, str(session.id))
+
+
+def part_path(session: UploadSession, number: int) -> str:
+    return os.path.join(session_dir(session), f"{number}.part")
+
+
+def write_part(
+    session: UploadSession, number: int, stream, checksum: str
+) -> UploadPart:
+    """
+    Stream part `number` of `session` to disk and record it
+
+    Raise PartTooLarge if more than CHUNKED_UPLOAD_PART_MAX_SIZE bytes are sent and
+    ChecksumMismatch if the sha256 of the content is not `checksum` (hex).
+    """
+    directory = session_dir(session)
+    os.makedirs(directory, exist_ok=True)
+
+    digest = hashlib.sha256()
+    size = 0
+
+    # written under a temporary name, so a failed retry keeps the previous copy
+    file = tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False)
+    with file:
+        try:
+            while chunk := stream.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > settings.CHUNKED_UPLOAD_PART_MAX_SIZE:
+                    raise PartTooLarge(
+                        f"A part must not be larger than "
+                        f"{settings.CHUNKED_UPLOAD_PART_MAX_SIZE} bytes."
+                    )
+                digest.update(chunk)
+                file.write(chunk)
+
+            if size == 0:
+                raise UploadError("A part must not be empty.")
+            if digest.hexdigest() != checksum.lower():
+                raise ChecksumMismatch(
+                    f"The {CHECKSUM_HEADER} of part {number} does not match its "
+                    "content."
+                )
+        except BaseException:
+            file.close()
+            os.remove(file.name)
+            raise
+
+    os.replace(file.name, part_path(session, number))
+
+    part, _ = UploadPart.objects.update_or_create(
+        session=session,
+        number=number,
+        defaults={"size": size, "checksum": digest.hexdigest()},
+    )
+    return part
+
+
+class PartsReader:
+    """
+    Read-only file object returning the content of a list of files one after another,
+    computing the sha256 of what was read in `digest`
+    """
+
+    def __init__(self, paths: list, size: int):
+        self.paths = list(paths)
+        self.size = size
+        self.file = None
+        self.digest = hashlib.sha256()
+
+    def read(self, size=-1) -> bytes:
+        chunks = []
+        while size != 0 and (self.file is not None or self.paths):
+            if self.file is None:
+                self.file = open(self.paths.pop(0), "rb")
+
+            chunk = self.file.read(size)
+            if not chunk:
+                self.file.close()
+                self.file = None
+                continue
+
+            self.digest.update(chunk)
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def complete_upload(session: UploadSession, checksums: dict) -> CourseMaterial:
+    """
+    Assemble the parts of `session` into a new course material and discard the session
+
+    `checksums` maps every part number the client sent to its sha256 - they must be
+    1..N and match the parts received.
+    """
+    parts = list(session.parts.order_by("number"))
+    received = {part.number: part.checksum for part in parts}
+
+    expected_numbers = list(range(1, len(checksums) + 1))
+    if sorted(checksums) != expected_numbers:
+        raise UploadError("Parts must be numbered from 1 without gaps.")
+
+    missing = [number for number in expected_numbers if number not in received]
+    if missing:
+        raise UploadError(f"Parts {missing} have not been uploaded.")
+
+    mismatched = [
+        number
+        for number in expected_numbers
+        if checksums[number].lower() != received[number]
+    ]
+    if mismatched:
+        raise ChecksumMismatch(f"The checksums of parts {mismatched} do not match.")
+
+    # parts sent after the last one listed are left out
+    parts = [part for part in parts if part.number in checksums]
+    reader = PartsReader(
+        [part_path(session, part.number) for part in parts],
+        sum(part.size for part in parts),
+    )
+
+    material = CourseMaterial(
+        title=session.title,
+        content=session.content,
+        duration=session.duration,
+        course_id=session.course_id,
+    )
+    try:
+        # copied to the storage one chunk at a time
+        material.upload.save(
+            session.filename, File(reader, session.filename), save=False
+        )
+    finally:
+        reader.close()
+
+    # the parts were hashed while copied - keep CourseMaterial.save() from reading the
+    # assembled file again to compute its ETag
+    material.upload_etag = f'"{reader.digest.hexdigest()}"'
+    material._etag_upload_name = material.upload.name
+
+    directory = session_dir(session)
+    try:
+        with transaction.atomic():
+            material.save()
+            session.delete()
+    except Exception:
+        material.upload.delete(save=False)
+        raise
+
+    shutil.rmtree(directory, ignore_errors=True)
+    return material
+
+
+def discard_session(session: UploadSession) -> None:
+    """
+    Delete `session`, its parts and their files
+    """
+    directory = session_dir(session)
+    session.delete()
+    shutil.rmtree(directory, ignore_errors=True)
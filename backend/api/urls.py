@@ -2,18 +2,27 @@ from django.urls import path
 from .views.views_user import CreateUserView, ListUserDetailView, ListUsersView
 from .views.views_course import (
     AddCourseReviewView,
+    BulkEnrollUserCourseView,
+    BulkUpdateCourseUserBlockStatusView,
     CreateUserCourseView,
     EnrollUserCourseView,
     ListCourseByUserView,
     ListCourseDetailView,
     ListCousesByCategoryView,
+    ListTopCoursesByCategoryView,
     RemoveStudentFromCourseView,
     UpdateCourseUserBlockStatusView,
 )
 
 from .views.views_course_material import (
     AddCourseMaterialView,
+    CompleteCourseMaterialUploadView,
+    CourseMaterialUploadView,
+    CreateSignedDownloadURLView,
     DownloadCourseMaterialAttachmentView,
+    InitiateCourseMaterialUploadView,
+    SignedDownloadCourseMaterialAttachmentView,
+    UploadCourseMaterialPartView,
 )
 from .views.views_status import UserStatus
 
@@ -26,36 +35,82 @@ urlpatterns = [
         name="list-three-courses-by-category",
     ),
     path(
-        "courses/<str:course_id>",
+        "courses/top-by-category",
+        ListTopCoursesByCategoryView.as_view(),
+        name="list-top-courses-by-category",
+    ),
+    path(
+        "courses/<uuid:course_id>",
         ListCourseDetailView.as_view(),
         name="list-course-details",
     ),
     path(
-        "courses/<str:course_id>/student",
+        "courses/<uuid:course_id>/student",
         RemoveStudentFromCourseView.as_view(),
         name="remove-student-from-course",
     ),
     path(
-        "courses/<str:course_id>/student/<str:student_id>",
+        "courses/<uuid:course_id>/students",
+        BulkEnrollUserCourseView.as_view(),
+        name="bulk-enroll-users-in-course",
+    ),
+    path(
+        "courses/<uuid:course_id>/students/block-status",
+        BulkUpdateCourseUserBlockStatusView.as_view(),
+        name="update-users-block-status-in-course",
+    ),
+    path(
+        "courses/<uuid:course_id>/student/<str:student_id>",
         UpdateCourseUserBlockStatusView.as_view(),
         name="update-user-block-status-in-course",
     ),
     path(
-        "courses/<str:course_id>/review",
+        "courses/<uuid:course_id>/review",
         AddCourseReviewView.as_view(),
         name="add-course-review",
     ),
     # ------------ Course Material ------------ #
     path(
-        "courses/<str:course_id>/course-material",
+        "courses/<uuid:course_id>/course-material",
         AddCourseMaterialView.as_view(),
         name="add-course-material",
     ),
+    # chunked upload: initiate, PUT parts, complete
+    path(
+        "courses/<uuid:course_id>/course-material/uploads",
+        InitiateCourseMaterialUploadView.as_view(),
+        name="initiate-course-material-upload",
+    ),
+    path(
+        "courses/materials/uploads/<uuid:upload_id>",
+        CourseMaterialUploadView.as_view(),
+        name="course-material-upload",
+    ),
+    path(
+        "courses/materials/uploads/<uuid:upload_id>/parts/<int:part_number>",
+        UploadCourseMaterialPartView.as_view(),
+        name="upload-course-material-part",
+    ),
+    path(
+        "courses/materials/uploads/<uuid:upload_id>/complete",
+        CompleteCourseMaterialUploadView.as_view(),
+        name="complete-course-material-upload",
+    ),
     path(
         "courses/materials/download",
         DownloadCourseMaterialAttachmentView.as_view(),
         name="download-course-material-attachment",
     ),
+    path(
+        "courses/materials/<uuid:material_id>/signed-url",
+        CreateSignedDownloadURLView.as_view(),
+        name="create-signed-course-material-url",
+    ),
+    path(
+        "courses/materials/signed/<str:token>",
+        SignedDownloadCourseMaterialAttachmentView.as_view(),
+        name="download-signed-course-material-attachment",
+    ),
     # ------------ User ------------ #
     # Update user status
     path(
@@ -1,16 +1,20 @@
 import os
-from uuid import uuid4
 from django.contrib.auth.models import User
-import jwt
 from rest_framework import generics
 from rest_framework.views import APIView
+from ..authentication import StatelessClaimsJWTAuthentication, TokenClaimsMixin
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from ..serializers.serializers_course import (
+    COURSE_CATEGORIES,
     AddCourseReviewSerializer,
+    BulkEnrollCourseSerializer,
+    BulkUpdateCourseUserBlockStatusSerializer,
     ListCoursesSerializer,
+    ListTopCoursesSerializer,
+    ListUserCoursesSerializer,
     CreateCourseSerializer,
     RemoveStudentFromCourseSerializer,
     UpdateCourseUserBlockStatusSerializer,
@@ -18,73 +22,92 @@ from ..serializers.serializers_course import (
 from django.db.utils import IntegrityError
 from rest_framework import serializers
 from api.models import Course, CourseTracker, StudentFeedback, CourseMaterial, Role
-from django.db.models import Q
+from django.db.models import (
+    Count,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Window,
+)
+from django.db.models.functions import Coalesce, RowNumber
 from datetime import datetime
 import pytz
 from django.utils import timezone
 from django.db import transaction
 from django.conf import settings
+from ..http_cache import cacheable_response
+from ..pagination import paginate_keyset
+from ..enrollment import enroll_users, set_learners_blocked
 
 
 class ListCousesByCategoryView(APIView):
     """
     Public route - List courses by course category
 
+    POST reads the parameters from the request body. GET reads them from the query string
+    and returns a response that browsers, proxies and CDNs can cache.
+
     Params:
     @category - Required parameter to filter course
-    @limit - Optional parameter to return x number of courses
+    @limit - Optional parameter to return x number of courses per page
+    @cursor - Optional parameter to return the page after the `next` token of a previous page
     """
 
     # Allow any access
     permission_classes = [AllowAny]
 
-    def post(self, request, format=None):
-        data = request.data
-        category = data.get("category")
-        limitExists = False
-        if "limit" in data:
-            limitExists = True
-            raw_limit = data.get("limit")
+    def list_courses(self, category, limit=None, cursor=None) -> dict:
+        courses = Course.objects.filter(category=category).values(
+            "name", "subcategory", "id", "author_name", "created_at"
+        )
+
+        # Page through courses in creation order, `limit` is applied as SQL LIMIT
+        courses, next_cursor = paginate_keyset(
+            courses, ("created_at", "id"), cursor, limit
+        )
+
+        formatted_courses = {"category": category, "courses": [], "next": next_cursor}
+
+        for course in courses:
+            formatted_courses.get("courses").append(
+                {
+                    "name": course.get("name"),
+                    "subcategory": course.get("subcategory"),
+                    "author": course.get("author_name"),
+                    "id": course.get("id"),
+                }
+            )
 
-        serializer = ListCoursesSerializer(data=request.data)
-        try:
-            if serializer.is_valid():
-                category = serializer.validated_data.get("category")
-
-                # if `limit` is provided in request body
-                if limitExists:
-                    validated_limit = serializer.validated_data.get("limit")
-                    courses = list(
-                        Course.objects.filter(category=category).values_list(
-                            "name", "subcategory", "id"
-                        )
-                    )[:validated_limit]
-                else:
-                    courses = list(
-                        Course.objects.filter(category=category).values_list(
-                            "name", "subcategory", "id"
-                        )
-                    )
+        return formatted_courses
 
-                formatted_courses = {"category": category, "courses": []}
+    def get(self, request, format=None):
+        serializer = ListCoursesSerializer(data=request.query_params)
 
-                for course in courses:
-                    name, subcategory, id = course
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-                    author = CourseTracker.objects.get(
-                        Q(course_id=id) & Q(profile="author")
-                    )
-                    author_first_name = author.user.first_name
-                    author_last_name = author.user.last_name
-
-                    formatted_courses.get("courses").append(
-                        {
-                            "name": name,
-                            "subcategory": subcategory,
-                            "author": f"{author_first_name} {author_last_name}",
-                            "id": id,
-                        }
-                    )
+        formatted_courses = self.list_courses(
+            serializer.validated_data.get("category"),
+            serializer.validated_data.get("limit"),
+            serializer.validated_data.get("cursor"),
+        )
+
+        return cacheable_response(request, formatted_courses)
+
+    def post(self, request, format=None):
+        serializer = ListCoursesSerializer(data=request.data)
+        try:
+            if serializer.is_valid():
+                formatted_courses = self.list_courses(
+                    serializer.validated_data.get("category"),
+                    serializer.validated_data.get("limit"),
+                    serializer.validated_data.get("cursor"),
+                )
 
                 return Response(
                     formatted_courses,
@@ -104,6 +127,69 @@ class ListCousesByCategoryView(APIView):
             )
 
 
+class ListTopCoursesByCategoryView(APIView):
+    """
+    Public route - List the first x courses of every course category in one query
+
+    Params:
+    @limit - Optional query parameter to return x number of courses per category (default 3)
+    """
+
+    # Allow any access
+    permission_classes = [AllowAny]
+
+    def get(self, request, format=None):
+        serializer = ListTopCoursesSerializer(data=request.query_params)
+
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors,
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        validated_limit = serializer.validated_data.get("limit")
+
+        # Number courses within each category and keep the first `limit` of each
+        courses = (
+            Course.objects.filter(category__in=COURSE_CATEGORIES)
+            .annotate(
+                row_number=Window(
+                    expression=RowNumber(),
+                    partition_by=F("category"),
+                    order_by=[F("created_at").asc(), F("id").asc()],
+                )
+            )
+            .filter(row_number__lte=validated_limit)
+            .order_by("category", "created_at", "id")
+            .values_list(
+                "category",
+                "name",
+                "subcategory",
+                "id",
+                "author_name",
+            )
+        )
+
+        formatted_courses = {
+            category: {"category": category, "courses": []}
+            for category in COURSE_CATEGORIES
+        }
+
+        for course in courses:
+            category, name, subcategory, id, author_name = course
+
+            formatted_courses.get(category).get("courses").append(
+                {
+                    "name": name,
+                    "subcategory": subcategory,
+                    "author": author_name,
+                    "id": id,
+                }
+            )
+
+        return cacheable_response(request, list(formatted_courses.values()))
+
+
 class ListCourseDetailView(APIView):
     """
     Public route - List course details, author, enrolled_students, course_feedback, course_materials
@@ -118,113 +204,108 @@ class ListCourseDetailView(APIView):
         localtz = utc.astimezone(timezone.get_current_timezone())
         return localtz.strftime(fmt)
 
-    def validate_course_id(self, course_id: str) -> bool:
-        if course_id in list(Course.objects.values_list("id", flat=True)):
-            return True
-        return False
-
     def get(self, request, course_id):
 
-        if not self.validate_course_id(course_id=course_id):
-            return Response(
-                f"The course_id you provided ({course_id}) does not exist.",
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         try:
 
-            # Course details
-            course_name, course_category, course_subcategory, course_description = (
-                Course.objects.filter(id=course_id).values_list(
-                    "name", "category", "subcategory", "description"
-                )[0]
+            # Course details - a primary key lookup that doubles as the existence check
+            course = (
+                Course.objects.filter(id=course_id)
+                .values_list(
+                    "name",
+                    "category",
+                    "subcategory",
+                    "description",
+                    "author_name",
+                    "author_username",
+                )
+                .first()
             )
 
-            # Author
-            author = CourseTracker.objects.get(
-                Q(course_id=course_id) & Q(profile="author")
-            )
-            author_username = author.user.username
-            author_first_name = author.user.first_name
-            author_last_name = author.user.last_name
+            if course is None:
+                return Response(
+                    f"The course_id you provided ({course_id}) does not exist.",
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-            # Enrolled students
+            (
+                course_name,
+                course_category,
+                course_subcategory,
+                course_description,
+                author_name,
+                author_username,
+            ) = course
+
+            # Enrolled students - joined with User to avoid a lookup per student
             enrolled_student_list = []
             enrolled_students = CourseTracker.objects.filter(
                 Q(course_id=course_id) & Q(profile="learner")
-            ).values("user", "is_blocked", "created_at")
+            ).values(
+                "user",
+                "user__username",
+                "user__first_name",
+                "user__last_name",
+                "is_blocked",
+                "created_at",
+            )
 
             for student in enrolled_students:
-                student_id = student.get("user")
                 enrolled_date_utc = student.get("created_at")
                 enrolled_date_local = self.convert_to_localtime(enrolled_date_utc)
-                is_blocked = student.get("is_blocked")
-                student = User.objects.get(id=student_id)
-                student_username = student.username
-                student_fullname = f"{student.first_name} {student.last_name}"
                 enrolled_student_list.append(
                     {
-                        "id": student_id,
-                        "username": student_username,
-                        "name": student_fullname,
-                        "is_blocked": is_blocked,
+                        "id": student.get("user"),
+                        "username": student.get("user__username"),
+                        "name": f"{student.get('user__first_name')} {student.get('user__last_name')}",
+                        "is_blocked": student.get("is_blocked"),
                         "enrolled_date": enrolled_date_local,
                     }
                 )
 
-            # Student feedback
+            # Student feedback - joined with User to avoid a lookup per feedback
             feedback_list = []
-            feedbacks = StudentFeedback.objects.filter(course__id=course_id)
-            feedback_count = len(feedbacks)
-
-            if feedback_count > 0:
-                for feedback in feedbacks:
-                    feedback_provided_by_student_full_name = f"{feedback.student.first_name} {feedback.student.last_name}"
-                    feedback_provided = feedback.feedback
-                    feedback_date_utc = feedback.created_at
-                    feedback_date_local = self.convert_to_localtime(feedback_date_utc)
-                    feedback_list.append(
-                        {
-                            "student": feedback_provided_by_student_full_name,
-                            "feedback": feedback_provided,
-                            "date": feedback_date_local,
-                        }
-                    )
+            feedbacks = (
+                StudentFeedback.objects.filter(course__id=course_id)
+                .order_by("created_at")
+                .values(
+                    "student__first_name",
+                    "student__last_name",
+                    "feedback",
+                    "created_at",
+                )
+            )
+
+            for feedback in feedbacks:
+                feedback_date_utc = feedback.get("created_at")
+                feedback_date_local = self.convert_to_localtime(feedback_date_utc)
+                feedback_list.append(
+                    {
+                        "student": f"{feedback.get('student__first_name')} {feedback.get('student__last_name')}",
+                        "feedback": feedback.get("feedback"),
+                        "date": feedback_date_local,
+                    }
+                )
+            feedback_count = len(feedback_list)
 
             # Course Material
             course_material_list = []
-            materials = CourseMaterial.objects.filter(
-                course__id=course_id
+            materials = CourseMaterial.objects.filter(course__id=course_id).values(
+                "id", "upload", "title", "content", "duration"
             )  # list of materials
-            if len(materials) > 0:
-                for material in materials:
-                    upload = material.upload  # may be empty string ("")
-                    id = material.id
-                    title = material.title
-                    content = material.content
-                    duration = material.duration
-                    if upload:
-                        upload_name = upload.name.split("/")[-1]
-                        course_material_list.append(
-                            {
-                                "id": id,
-                                "hasFile": True,
-                                "fileName": upload_name,
-                                "title": title,
-                                "content": content,
-                                "duration": duration,
-                            }
-                        )
-                    else:
-                        course_material_list.append(
-                            {
-                                "id": id,
-                                "hasFile": False,
-                                "title": title,
-                                "content": content,
-                                "duration": duration,
-                            }
-                        )
+
+            for material in materials:
+                upload = material.get("upload")  # may be None or empty string ("")
+                course_material = {
+                    "id": material.get("id"),
+                    "hasFile": bool(upload),
+                    "title": material.get("title"),
+                    "content": material.get("content"),
+                    "duration": material.get("duration"),
+                }
+                if upload:
+                    course_material["fileName"] = upload.split("/")[-1]
+                course_material_list.append(course_material)
 
             response = {
                 "name": course_name,
@@ -232,7 +313,7 @@ class ListCourseDetailView(APIView):
                 "subcategory": course_subcategory,
                 "description": course_description,
                 "enrolled_student": enrolled_student_list,
-                "author": f"{author_first_name} {author_last_name}",
+                "author": author_name,
                 "author_username": author_username,
                 "feedback_count": feedback_count,
                 "feedback": feedback_list,
@@ -250,79 +331,106 @@ class ListCourseDetailView(APIView):
             )
 
 
-class ListCourseByUserView(APIView):
+class ListCourseByUserView(TokenClaimsMixin, APIView):
     """
     Protected route - List courses that are either authored or enrolled by an authenticated user
 
     Params:
     @username: Username of the authenticated user
+    @category: Optional query parameter to only list courses of a category
+    @subcategory: Optional query parameter to only list courses of a subcategory
+    @counts: Optional query parameter - when true, include each course's learner and material counts
+    @limit: Optional query parameter to return x number of courses per page
+    @cursor: Optional query parameter to return the page after the `next` token of a previous page
     """
 
+    # read-only - authenticate from token claims without loading the User
+    authentication_classes = [StatelessClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
-
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
+    def count_subquery(self, queryset):
+        # Count rows of `queryset` correlated to the outer course, 0 when there is none
+        counts = (
+            queryset.order_by().values("course").annotate(count=Count("*")).values("count")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
 
     def get(self, request, username):
-        header = request.headers
-
-        # get user's role
-        user_role = Role.objects.filter(userRole__username=username)[0].role
 
         try:
-            self.validate_user(header, username)
-
-            formatted_response = {"user": username, "courses": []}
-
-            if user_role == "student":
-                user_courses = CourseTracker.objects.filter(
-                    Q(user__username=username) & Q(profile="learner")
-                ).values("course", "is_blocked")
+            self.validate_user(request, username)
+
+            serializer = ListUserCoursesSerializer(data=request.query_params)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            category = serializer.validated_data.get("category")
+            subcategory = serializer.validated_data.get("subcategory")
+            include_counts = serializer.validated_data.get("counts")
+
+            # Courses a student is enrolled in or a teacher authored, joined with Course
+            user_courses = CourseTracker.objects.filter(
+                Q(user__username=username)
+                & (
+                    (Q(user__userRole__role="student") & Q(profile="learner"))
+                    | (Q(user__userRole__role="teacher") & Q(profile="author"))
+                )
+            )
 
-            elif user_role == "teacher":
-                user_courses = CourseTracker.objects.filter(
-                    Q(user__username=username) & Q(profile="author")
-                ).values("course", "is_blocked")
+            if category is not None:
+                user_courses = user_courses.filter(course__category=category)
+
+            if subcategory is not None:
+                user_courses = user_courses.filter(course__subcategory=subcategory)
+
+            user_courses = user_courses.values(
+                "course",
+                "is_blocked",
+                "created_at",
+                "id",
+                "course__name",
+                "course__category",
+                "course__subcategory",
+                "course__author_name",
+            )
 
-            for course in user_courses:
-                course_id = course.get("course")
-                learner_is_blocked = course.get("is_blocked")
-                _course = Course.objects.filter(id=course_id).values(
-                    "category", "name", "subcategory"
+            if include_counts:
+                user_courses = user_courses.annotate(
+                    learner_count=self.count_subquery(
+                        CourseTracker.objects.filter(
+                            Q(course=OuterRef("course")) & Q(profile="learner")
+                        )
+                    ),
+                    material_count=self.count_subquery(
+                        CourseMaterial.objects.filter(course=OuterRef("course"))
+                    ),
                 )
-                enrolled_course_category = _course[0].get("category")
-                enrolled_course_subcategory = _course[0].get("subcategory")
-                enrolled_course_name = _course[0].get("name")
 
-                if user_role == "student":
-                    author = CourseTracker.objects.filter(
-                        Q(course__id=course_id) & Q(profile="author")
-                    )[0].user
+            # Page through courses in enrollment order
+            user_courses, next_cursor = paginate_keyset(
+                user_courses,
+                ("created_at", "id"),
+                serializer.validated_data.get("cursor"),
+                serializer.validated_data.get("limit"),
+            )
 
-                    author_full_name = f"{author.first_name} {author.last_name}"
+            formatted_response = {"user": username, "courses": [], "next": next_cursor}
 
-                elif user_role == "teacher":
-                    author = User.objects.get(username=username)
-                    author_full_name = f"{author.first_name} {author.last_name}"
+            for course in user_courses:
+                course_detail = {
+                    "name": course.get("course__name"),
+                    "category": course.get("course__category"),
+                    "subcategory": course.get("course__subcategory"),
+                    "author": course.get("course__author_name"),
+                    "id": course.get("course"),
+                    "is_blocked": course.get("is_blocked"),
+                }
 
-                formatted_response.get("courses").append(
-                    {
-                        "name": enrolled_course_name,
-                        "category": enrolled_course_category,
-                        "subcategory": enrolled_course_subcategory,
-                        "author": author_full_name,
-                        "id": course_id,
-                        "is_blocked": learner_is_blocked,
-                    }
-                )
+                if include_counts:
+                    course_detail["learner_count"] = course.get("learner_count")
+                    course_detail["material_count"] = course.get("material_count")
+
+                formatted_response.get("courses").append(course_detail)
 
             # existing_status = Status.objects.filter(userStatus__username=username)[
             #     0
@@ -345,51 +453,39 @@ class ListCourseByUserView(APIView):
             return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class CreateUserCourseView(APIView):
+class CreateUserCourseView(TokenClaimsMixin, APIView):
     """
     Protected route - Create new course
     """
 
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
-        decoded_role = decoded.get("role")
+    def validate_user(self, request, username) -> None:
+        super().validate_user(request, username)
 
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-
-        if decoded_role != "teacher":
+        if request.claims.get("role") != "teacher":
             raise ValidationError(
                 {"Error": "Only user who is a teacher can create new course"}
             )
 
-        else:
-            return
-
     def post(self, request, format=None):
         data = request.data
         username = data.get("author")
-        header = request.headers
 
         try:
-            self.validate_user(header, username)
+            self.validate_user(request, username)
             serializer = CreateCourseSerializer(data=data)
             if serializer.is_valid():
-                author = serializer.validated_data.pop("author")  # username
-                user_obj = User.objects.get(username=author)
-                course_unique_id = uuid4()
-                course_tracker_unique_id = uuid4()
+                # author username matches the token, reuse the authenticated user
+                serializer.validated_data.pop("author")
+                user_obj = request.user
                 with transaction.atomic():
                     created_course = Course.objects.create(
-                        id=course_unique_id, **serializer.validated_data
+                        **serializer.validated_data,
+                        **Course.author_details(user_obj),
                     )
                     created_course_id = created_course.id
                     CourseTracker.objects.create(
-                        id=course_tracker_unique_id,
                         user=user_obj,
                         course=created_course,
                         profile="author",
@@ -403,7 +499,7 @@ class CreateUserCourseView(APIView):
             return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class UpdateCourseUserBlockStatusView(APIView):
+class UpdateCourseUserBlockStatusView(TokenClaimsMixin, APIView):
     """
     Protected route - Block or unblock student from a specific course
 
@@ -413,25 +509,13 @@ class UpdateCourseUserBlockStatusView(APIView):
 
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
-
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
-
     def patch(self, request, course_id, student_id):
         data = request.data
         new_blocked_status = data.get("isBlocked")
         username = data.get("username")
-        header = request.headers
 
         try:
-            self.validate_user(header, username)
+            self.validate_user(request, username)
 
             serializer = UpdateCourseUserBlockStatusSerializer(data=data)
             if serializer.is_valid():
@@ -457,35 +541,21 @@ class UpdateCourseUserBlockStatusView(APIView):
             return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class EnrollUserCourseView(APIView):
+class EnrollUserCourseView(TokenClaimsMixin, APIView):
 
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
-
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
-
     def post(self, request, format=None):
         data = request.data
-        header = request.headers
 
         try:
             course_id = data.get("courseId")
             student_username = data.get("studentUsername")
-            self.validate_user(header, student_username)
+            self.validate_user(request, student_username)
 
             course_to_enroll = Course.objects.get(id=course_id)
             student_obj = User.objects.get(username=student_username)
-            unique_coursetracker_id = uuid4()
             CourseTracker.objects.create(
-                id=unique_coursetracker_id,
                 user=student_obj,
                 course=course_to_enroll,
                 is_blocked=False,
@@ -498,29 +568,124 @@ class EnrollUserCourseView(APIView):
             return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class AddCourseReviewView(APIView):
+class CourseAuthorMixin(TokenClaimsMixin):
+    """
+    Mixin for views managing the learners or materials of a course - only its author
+    may use them
+    """
+
+    def get_authored_course(self, request, course_id) -> Course:
+        course = Course.objects.only("id", "author_id").filter(id=course_id).first()
+
+        if course is None:
+            raise NotFound(f"The course_id you provided ({course_id}) does not exist.")
+
+        if course.author_id != request.user.id:
+            raise PermissionDenied(
+                {"Error": "Only the author of the course can manage it"}
+            )
+
+        return course
+
+
+class BulkEnrollUserCourseView(CourseAuthorMixin, APIView):
+    """
+    Protected route - Enroll many users into a course in one call (course author only)
+
+    Params:
+    @username - Username of the authenticated user (author of the course)
+    @studentUsernames - List of usernames to enroll as learners
+    """
 
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
+    def post(self, request, course_id):
+        data = request.data
+
+        try:
+            self.validate_user(request, data.get("username"))
 
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
+            serializer = BulkEnrollCourseSerializer(data=data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            course = self.get_authored_course(request, course_id)
+            summary = enroll_users(
+                course, serializer.validated_data["studentUsernames"]
+            )
+            return Response(summary, status=status.HTTP_200_OK)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except (NotFound, PermissionDenied) as e:
+            return Response(e.args[0], status=e.status_code)
+
+        except Exception as e:
+            return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BulkUpdateCourseUserBlockStatusView(CourseAuthorMixin, APIView):
+    """
+    Protected route - Block or unblock many learners of a course in one call
+    (course author only)
+
+    Params:
+    @username - Username of the authenticated user (author of the course)
+    @isBlocked - New blocked status
+    @studentIds - Optional list of ids of the learners to update
+    @enrolledAfter - Optional parameter to only update learners enrolled after this time
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def patch(self, request, course_id):
+        data = request.data
+
+        try:
+            self.validate_user(request, data.get("username"))
+
+            serializer = BulkUpdateCourseUserBlockStatusSerializer(data=data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            course = self.get_authored_course(request, course_id)
+            validated_data = serializer.validated_data
+            learners = set_learners_blocked(
+                course,
+                validated_data["isBlocked"],
+                student_ids=validated_data.get("studentIds"),
+                enrolled_after=validated_data.get("enrolledAfter"),
+            )
+
+            response = {
+                "courseId": course.id,
+                "updated": len(learners),
+                "learners": learners,
+            }
+            return Response(response, status=status.HTTP_200_OK)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except (NotFound, PermissionDenied) as e:
+            return Response(e.args[0], status=e.status_code)
+
+        except Exception as e:
+            return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AddCourseReviewView(TokenClaimsMixin, APIView):
+
+    permission_classes = [IsAuthenticated]
 
     def post(self, request, course_id):
         data = request.data
-        header = request.headers
 
         try:
             username = data.get("username")
             review = data.get("review")
-            self.validate_user(header, username)
+            self.validate_user(request, username)
 
             serializer = AddCourseReviewSerializer(data=data)
 
@@ -528,9 +693,7 @@ class AddCourseReviewView(APIView):
                 course_to_add_review = Course.objects.get(id=course_id)
                 student_obj = User.objects.get(username=username)
 
-                unique_studenfeedback_id = uuid4()
                 StudentFeedback.objects.create(
-                    id=unique_studenfeedback_id,
                     student=student_obj,
                     course=course_to_add_review,
                     feedback=review,
@@ -545,30 +708,18 @@ class AddCourseReviewView(APIView):
             return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class RemoveStudentFromCourseView(APIView):
+class RemoveStudentFromCourseView(TokenClaimsMixin, APIView):
 
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
-
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
-
     def delete(self, request, course_id):
         data = request.data
-        header = request.headers
 
         try:
             student_username_to_delete = data.get("studentUsername")
             username = data.get("authenticatedUsername")
 
-            self.validate_user(header, username)
+            self.validate_user(request, username)
 
             serializer = RemoveStudentFromCourseSerializer(data=data)
 
@@ -1,15 +1,15 @@
 from django.conf import settings
 import mimetypes
 import os
-from uuid import uuid4
+from io import BytesIO
 from django.contrib.auth.models import User
-import jwt
 from rest_framework import generics
 from rest_framework.views import APIView
+from ..authentication import StatelessClaimsJWTAuthentication, TokenClaimsMixin
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from ..serializers.serializers_course import (
     AddCourseReviewSerializer,
     ListCoursesSerializer,
@@ -21,50 +21,63 @@ from django.conf import settings
 
 from django.http import FileResponse, HttpResponse
 from wsgiref.util import FileWrapper
-from ..serializers.serializers_course_material import AddCourseMaterialSerializer
+from ..serializers.serializers_course_material import (
+    AddCourseMaterialSerializer,
+    CompleteCourseMaterialUploadSerializer,
+    InitiateCourseMaterialUploadSerializer,
+)
+from ..downloads import file_response
+from .views_course import CourseAuthorMixin
+from ..signed_urls import sign_download, verify_download
+from ..uploads import (
+    CHECKSUM_HEADER,
+    PartTooLarge,
+    UploadError,
+    complete_upload,
+    discard_session,
+    write_part,
+)
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.db.utils import IntegrityError
 from rest_framework import serializers
-from api.models import Course, CourseTracker, StudentFeedback, CourseMaterial, Role
+from api.models import (
+    Course,
+    CourseTracker,
+    StudentFeedback,
+    CourseMaterial,
+    Role,
+    UploadSession,
+)
 from django.db.models import Q
 from datetime import datetime
 import pytz
 from django.utils import timezone
 from django.db import transaction
 
-class AddCourseMaterialView(APIView):
+class AddCourseMaterialView(TokenClaimsMixin, APIView):
     """
     Protected route - Add course material to course
     """
 
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
-
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
-
     def post(self, request, course_id):
         data = request.data
-        header = request.headers
         serializer = AddCourseMaterialSerializer(data=data)
 
         username = data.get("authenticatedUsername")
         try:
-            self.validate_user(header, username)
+            self.validate_user(request, username)
             if serializer.is_valid():
                 course = Course.objects.get(id=course_id)
-                unique_coursematerial_id = uuid4()
 
                 # If upload is provided
                 if "upload" in data.keys():
                     CourseMaterial.objects.create(
-                        id=unique_coursematerial_id,
                         content=data.get("content"),
                         upload=data.get("upload"),
                         title=data.get("title"),
@@ -74,7 +87,6 @@ class AddCourseMaterialView(APIView):
                 else:
                     # If upload is not provided provided
                     CourseMaterial.objects.create(
-                        id=unique_coursematerial_id,
                         content=data.get("content"),
                         title=data.get("title"),
                         duration=data.get("duration"),
@@ -96,49 +108,411 @@ class AddCourseMaterialView(APIView):
             )
 
 
-class DownloadCourseMaterialAttachmentView(APIView):
+class DownloadCourseMaterialAttachmentView(TokenClaimsMixin, APIView):
     """
     Protected route - Download course material attachment
+
+    Supports single `Range` requests (resume, seeking) validated with `If-Range`.
+    GET takes the parameters from the query string so players can request ranges.
+
+    Params:
+    @authenticatedUsername - Username of the authenticated user
+    @materialId - Id of the course material
     """
 
+    # read-only - authenticate from token claims without loading the User
+    authentication_classes = [StatelessClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
-
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
+    def get(self, request):
+        return self.download(request, request.query_params)
 
     def post(self, request):
-        data = request.data
-        header = request.headers
+        return self.download(request, request.data)
 
+    def download(self, request, data):
         username = data.get("authenticatedUsername")
         material_id = data.get("materialId")
 
         try:
-            self.validate_user(header, username)
+            self.validate_user(request, username)
+
+            upload, upload_etag = (
+                CourseMaterial.objects.filter(id=material_id)
+                .values_list("upload", "upload_etag")
+                .first()
+            ) or (None, None)
+            if not upload:
+                return Response(
+                    f"The materialId you provided ({material_id}) has no attachment.",
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            return file_response(request, upload, etag=upload_etag)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except DjangoValidationError:
+            # materialId is not a UUID
+            return Response(
+                f"The materialId you provided ({material_id}) is not valid.",
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        except Exception as e:
+            return Response(
+                e.args,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class CreateSignedDownloadURLView(TokenClaimsMixin, APIView):
+    """
+    Protected route - Create a short-lived signed URL to download a course material
+    attachment
+
+    The URL can be fetched without an Authorization header (eg: <video src>, a CDN)
+    until it expires after SIGNED_DOWNLOAD_URL_MAX_AGE seconds.
+
+    Params:
+    @authenticatedUsername - Username of the authenticated user
+    """
+
+    # read-only - authenticate from token claims without loading the User
+    authentication_classes = [StatelessClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, material_id):
+        username = request.data.get("authenticatedUsername")
+
+        try:
+            self.validate_user(request, username)
+
+            upload, upload_etag = (
+                CourseMaterial.objects.filter(id=material_id)
+                .values_list("upload", "upload_etag")
+                .first()
+            ) or (None, None)
+            if not upload:
+                return Response(
+                    f"The materialId you provided ({material_id}) has no attachment.",
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            token, expires = sign_download(upload, upload_etag)
+            url = reverse("download-signed-course-material-attachment", args=[token])
+            response = {
+                "url": request.build_absolute_uri(url),
+                "expiresAt": datetime.fromtimestamp(expires, tz=pytz.UTC),
+            }
+            return Response(response, status=status.HTTP_201_CREATED)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except Exception as e:
+            return Response(
+                e.args,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class SignedDownloadCourseMaterialAttachmentView(APIView):
+    """
+    Public route - Download a course material attachment from a signed URL
+
+    Only the signature of the URL is checked (no JWT, no database query). The response
+    is cacheable by browsers and proxies until the URL expires.
+    """
+
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request, token):
+        try:
+            name, etag, remaining = verify_download(token)
+        except signing.SignatureExpired:
+            return Response(
+                "The download URL has expired.", status=status.HTTP_403_FORBIDDEN
+            )
+        except signing.BadSignature:
+            return Response(
+                "The download URL is invalid.", status=status.HTTP_403_FORBIDDEN
+            )
 
-            material = CourseMaterial.objects.get(id=material_id)
+        try:
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = file_response(request, name, etag=etag)
+            elif etag:
+                response.headers["ETag"] = etag
+
+        except FileNotFoundError:
+            return Response(
+                "The attachment of this download URL no longer exists.",
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        patch_cache_control(response, public=True, max_age=remaining)
+        return response
 
-            full_path = os.path.join(settings.MEDIA_ROOT, material.upload.path)
 
-            material_file_handle = full_path
+class UploadSessionMixin(TokenClaimsMixin):
+    """
+    Mixin for chunked upload views - an upload session is only visible to its creator
+    """
 
-            document = open(material_file_handle, "rb")
+    def get_upload_session(self, request, upload_id) -> UploadSession:
+        session = UploadSession.objects.filter(
+            id=upload_id, user_id=request.user.id
+        ).first()
 
-            content = document.read()
+        if session is None:
+            raise NotFound(f"The uploadId you provided ({upload_id}) does not exist.")
 
-            response = HttpResponse(
-                content,
-                content_type=mimetypes.guess_type(full_path),
+        return session
+
+
+class InitiateCourseMaterialUploadView(CourseAuthorMixin, APIView):
+    """
+    Protected route - Start a chunked upload of a course material attachment (course
+    author only)
+
+    Params:
+    @authenticatedUsername - Username of the authenticated user
+    @title, @content, @duration - Fields of the course material created on completion
+    @filename - Name of the uploaded file
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, course_id):
+        data = request.data
+        serializer = InitiateCourseMaterialUploadSerializer(data=data)
+
+        try:
+            self.validate_user(request, data.get("authenticatedUsername"))
+
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            course = self.get_authored_course(request, course_id)
+
+            session = UploadSession.objects.create(
+                user=request.user,
+                course=course,
+                **serializer.validated_data,
             )
-            return response
+            response = {
+                "uploadId": session.id,
+                "partMaxSize": settings.CHUNKED_UPLOAD_PART_MAX_SIZE,
+            }
+            return Response(response, status=status.HTTP_201_CREATED)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except (NotFound, PermissionDenied) as e:
+            return Response(e.args[0], status=e.status_code)
+
+        except Exception as e:
+            return Response(
+                e.args,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class CourseMaterialUploadView(UploadSessionMixin, APIView):
+    """
+    Protected route - List the parts received by a chunked upload (to resume it) or
+    abort it
+
+    Params:
+    @authenticatedUsername - Username of the authenticated user (query string)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, upload_id):
+        username = request.query_params.get("authenticatedUsername")
+
+        try:
+            self.validate_user(request, username)
+            session = self.get_upload_session(request, upload_id)
+
+            parts = session.parts.order_by("number").values_list(
+                "number", "size", "checksum"
+            )
+            response = {
+                "uploadId": session.id,
+                "filename": session.filename,
+                "parts": [
+                    {"partNumber": number, "size": size, "checksum": checksum}
+                    for number, size, checksum in parts
+                ],
+            }
+            return Response(response, status=status.HTTP_200_OK)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except NotFound as e:
+            return Response(e.args[0], status=e.status_code)
+
+        except Exception as e:
+            return Response(
+                e.args,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def delete(self, request, upload_id):
+        username = request.query_params.get("authenticatedUsername")
+
+        try:
+            self.validate_user(request, username)
+            discard_session(self.get_upload_session(request, upload_id))
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except NotFound as e:
+            return Response(e.args[0], status=e.status_code)
+
+        except Exception as e:
+            return Response(
+                e.args,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class UploadCourseMaterialPartView(UploadSessionMixin, APIView):
+    """
+    Protected route - Upload one part of a chunked upload
+
+    The request body is the raw content of the part, streamed to disk as it is
+    received. Uploading a part number again replaces it.
+
+    Params:
+    @authenticatedUsername - Username of the authenticated user (query string)
+    @X-Checksum-SHA256 - Header, hex sha256 of the part
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def put(self, request, upload_id, part_number):
+        username = request.query_params.get("authenticatedUsername")
+        checksum = request.headers.get(CHECKSUM_HEADER)
+
+        try:
+            self.validate_user(request, username)
+            session = self.get_upload_session(request, upload_id)
+
+            if part_number < 1:
+                return Response(
+                    "partNumber must be greater than 0.",
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if not checksum:
+                return Response(
+                    f"The {CHECKSUM_HEADER} header is required.",
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                content_length = int(request.META.get("CONTENT_LENGTH") or 0)
+            except ValueError:
+                return Response(
+                    "The Content-Length header must be an integer.",
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # reject oversized parts before reading them
+            if content_length > settings.CHUNKED_UPLOAD_PART_MAX_SIZE:
+                raise PartTooLarge(
+                    f"A part must not be larger than "
+                    f"{settings.CHUNKED_UPLOAD_PART_MAX_SIZE} bytes."
+                )
+
+            # request.stream is None for an empty body
+            stream = request.stream or BytesIO()
+            part = write_part(session, part_number, stream, checksum)
+            response = {
+                "partNumber": part.number,
+                "size": part.size,
+                "checksum": part.checksum,
+            }
+            return Response(response, status=status.HTTP_200_OK)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except NotFound as e:
+            return Response(e.args[0], status=e.status_code)
+
+        except PartTooLarge as e:
+            return Response(
+                e.args[0], status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+            )
+
+        except UploadError as e:
+            return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+
+        except Exception as e:
+            return Response(
+                e.args,
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+class CompleteCourseMaterialUploadView(UploadSessionMixin, APIView):
+    """
+    Protected route - Assemble the parts of a chunked upload into a new course material
+
+    Params:
+    @authenticatedUsername - Username of the authenticated user
+    @parts - List of {partNumber, checksum} of every part, numbered from 1
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, upload_id):
+        data = request.data
+        serializer = CompleteCourseMaterialUploadSerializer(data=data)
+
+        try:
+            self.validate_user(request, data.get("authenticatedUsername"))
+            session = self.get_upload_session(request, upload_id)
+
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            parts = serializer.validated_data["parts"]
+            checksums = {part["partNumber"]: part["checksum"] for part in parts}
+            if len(checksums) != len(parts):
+                return Response(
+                    "partNumber must be unique.", status=status.HTTP_400_BAD_REQUEST
+                )
+
+            material = complete_upload(session, checksums)
+            response = {
+                "materialId": material.id,
+                "upload": material.upload.name,
+                "etag": material.upload_etag,
+            }
+            return Response(response, status=status.HTTP_201_CREATED)
+
+        except ValidationError as e:
+            return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
+
+        except NotFound as e:
+            return Response(e.args[0], status=e.status_code)
+
+        except UploadError as e:
+            return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
+
+        except SuspiciousFileOperation as e:
+            # session started with a filename the storage refuses
+            return Response(e.args[0], status=status.HTTP_400_BAD_REQUEST)
 
         except Exception as e:
             return Response(
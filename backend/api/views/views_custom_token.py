@@ -1,6 +1,49 @@
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenViewBase
-from ..serializers.serializers_custom_token import MyTokenObtainPairSerializer
+
+from ..revocation import revocation_list
+from ..serializers.serializers_custom_token import (
+    MyTokenObtainPairSerializer,
+    MyTokenRefreshSerializer,
+    TokenRevokeSerializer,
+    token_expiry,
+)
 
 
 class MyTokenObtainPairView(TokenViewBase):
     serializer_class = MyTokenObtainPairSerializer
+
+
+class MyTokenRefreshView(TokenViewBase):
+    serializer_class = MyTokenRefreshSerializer
+
+
+class TokenRevokeView(APIView):
+    """
+    Revoke the refresh token in the request body and the bearer access token (logout)
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, format=None):
+        try:
+            serializer = TokenRevokeSerializer(
+                data=request.data, context={"request": request}
+            )
+
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            for token in (serializer.validated_data["refresh"], request.auth):
+                revocation_list.revoke(
+                    token[api_settings.JTI_CLAIM], token_expiry(token)
+                )
+
+            return Response(status=status.HTTP_205_RESET_CONTENT)
+
+        except Exception as e:
+            return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -2,6 +2,7 @@ import os
 from django.contrib.auth.models import User
 from rest_framework import generics
 from rest_framework.views import APIView
+from ..authentication import TokenClaimsMixin
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated, AllowAny
@@ -17,35 +18,21 @@ from django.db.models import Q
 from datetime import datetime
 import pytz
 from django.utils import timezone
-import jwt
-from django.core.exceptions import ValidationError
 from django.conf import settings
 
-class UserStatus(APIView):
+class UserStatus(TokenClaimsMixin, APIView):
 
     # Allow any access
     permission_classes = [IsAuthenticated]
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
-
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
-
     def patch(self, request, format=None):
         data = request.data
-        header = request.headers
 
         new_status = data.get("status")
         username = data.get("username")
 
         try:
-            self.validate_user(header, username)
+            self.validate_user(request, username)
             serializer = PatchUserStatusSerializer(data=data)
 
             if serializer.is_valid():
@@ -73,11 +60,10 @@ class UserStatus(APIView):
 
     def post(self, request, format=None):
         data = request.data
-        header = request.headers
 
         username = data.get("username")
         try:
-            self.validate_user(header, username)
+            self.validate_user(request, username)
             serializer = GetUserStatusSerializer(data=data)
             if serializer.is_valid():
 
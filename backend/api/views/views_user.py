@@ -2,18 +2,22 @@ from django.utils import timezone
 import os
 from django.shortcuts import render
 from django.contrib.auth.models import User
-from django.db.models import Q
-import jwt
+from django.db.models import F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Concat
 import pytz
 from rest_framework import generics
 from rest_framework.views import APIView
+from ..authentication import StatelessClaimsJWTAuthentication, TokenClaimsMixin
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
+import io
 from rest_framework.exceptions import ValidationError
 
 from ..models import Role, Interest, CourseTracker, Course, Status
-from ..serializers.serializers_user import CustomUserSerializer
+from ..serializers.serializers_user import CustomUserSerializer, ListUsersSerializer
+from ..pagination import paginate_keyset
+from ..provisioning import guess_format, provision_users, read_records
 from django.db.utils import IntegrityError
 from rest_framework import serializers
 from django.conf import settings
@@ -61,48 +65,120 @@ class CreateUserView(APIView):
             )
 
 
-class ListUsersView(APIView):
+class BulkCreateUserView(APIView):
     """
-    View to list all users
+    View to register a cohort of users from an uploaded CSV or JSONL file (admin only)
+
+    Params:
+    @file - CSV or JSONL file with one user per record, see api/provisioning.py
+    @format - Optional parameter (csv, jsonl). Guessed from the file extension if absent
     """
 
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, format=None):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"file": ["No file was submitted."]}, status=status.HTTP_400_BAD_REQUEST
+            )
 
-    def validate_user(self, request_header, username) -> bool:
-        access_token = request_header.get("Authorization").split(" ")[-1]
-        # jwt_secret = os.getenv("SECRET_KEY")
-        jwt_secret = settings.SECRET_KEY
-        decoded = jwt.decode(access_token, jwt_secret, algorithms="HS256")
-        decoded_username = decoded.get("username")
+        try:
+            records = read_records(
+                io.TextIOWrapper(upload, encoding="utf-8-sig", newline=""),
+                request.data.get("format") or guess_format(upload.name),
+            )
+            report = provision_users(records)
+
+            response_status = (
+                status.HTTP_201_CREATED
+                if report["created"]
+                else status.HTTP_400_BAD_REQUEST
+            )
+            return Response(report, status=response_status)
+
+        except serializers.ValidationError as e:
+            return Response(e.args, status=status.HTTP_400_BAD_REQUEST)
 
-        if username != decoded_username:
-            raise ValidationError({"Error": "Bearer token does not match username"})
-        else:
-            return
+        except UnicodeDecodeError:
+            return Response(
+                ["file must be UTF-8 encoded."], status=status.HTTP_400_BAD_REQUEST
+            )
+
+        except Exception as e:
+            return Response(e.args, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ListUsersView(TokenClaimsMixin, APIView):
+    """
+    View to list all users sorted by full name
+
+    Params:
+    @username - Username of the authenticated user
+    @role - Optional parameter to only list users with role (teacher, student)
+    @limit - Optional parameter to paginate the list, returning x number of users per page.
+             Paginated responses are {"users": [...], "next": token to pass as `cursor`
+             for the next page, null on the last page}.
+    @cursor - Optional parameter to return the page after a previous page
+    """
+
+    # read-only - authenticate from token claims without loading the User
+    authentication_classes = [StatelessClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
 
     def post(self, request):
         data = request.data
         username = data.get("username")
-        header = request.headers
 
         try:
-            self.validate_user(header, username)
-            users = User.objects.all().values_list(
-                "username", "first_name", "last_name"
+            self.validate_user(request, username)
+
+            serializer = ListUsersSerializer(data=data)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+            role = serializer.validated_data.get("role")
+            limit = serializer.validated_data.get("limit")
+            cursor = serializer.validated_data.get("cursor")
+
+            # Fetch users with their role in one joined query, sorted in SQL
+            users = (
+                User.objects.exclude(username="admin")
+                .filter(userRole__isnull=False)
+                .annotate(
+                    fullname=Concat("first_name", Value(" "), "last_name"),
+                    role=F("userRole__role"),
+                )
+                .values("fullname", "role", "username")
             )
-            user_list = []
-            for user in users:
-                username, first_name, last_name = user
-                print(username)
-                if username != "admin":
-                    full_name = f"{first_name} {last_name}"
-                    role = Role.objects.filter(userRole__username=username)[0].role
-                    user_list.append(
-                        {"fullname": full_name, "role": role, "username": username}
-                    )
-                    sorted_user_list = sorted(user_list, key=lambda x: x["fullname"])
-            print(sorted_user_list)
-            return Response(sorted_user_list, status=status.HTTP_200_OK)
+
+            if role is not None:
+                users = users.filter(userRole__role=role)
+
+            if limit is not None or cursor is not None:
+                users, next_cursor = paginate_keyset(
+                    users, ("fullname", "username"), cursor, limit
+                )
+            else:
+                users = users.order_by("fullname", "username")
+
+            user_list = [
+                {
+                    "fullname": user.get("fullname"),
+                    "role": user.get("role"),
+                    "username": user.get("username"),
+                }
+                for user in users
+            ]
+
+            if limit is not None or cursor is not None:
+                # in the body, like the course listings - a custom header would not be
+                # readable by cross-origin clients
+                return Response(
+                    {"users": user_list, "next": next_cursor}, status=status.HTTP_200_OK
+                )
+
+            return Response(user_list, status=status.HTTP_200_OK)
 
         except ValidationError as e:
             return Response(e.args[0], status=status.HTTP_401_UNAUTHORIZED)
@@ -131,62 +207,70 @@ class ListUserDetailView(APIView):
     def get(self, request, username):
         try:
 
-            # Get user name
-            user = User.objects.get(username=username)
-            first_name = user.first_name
-            last_name = user.last_name
-
-            # Get user role
-            role = Role.objects.get(userRole__username=username).role
+            # Get user name, role and status
+            user = (
+                User.objects.filter(username=username)
+                .annotate(
+                    role=F("userRole__role"),
+                    user_status=Subquery(
+                        Status.objects.filter(userStatus=OuterRef("pk")).values(
+                            "status"
+                        )[:1]
+                    ),
+                )
+                .values("id", "first_name", "last_name", "role", "user_status")
+                .get()
+            )
+            first_name = user.get("first_name")
+            last_name = user.get("last_name")
+            role = user.get("role")
+            userStatus = user.get("user_status")
 
             # Get user interests
             interests = list(
-                Interest.objects.filter(studentInterest__username=username).values(
+                Interest.objects.filter(studentInterest_id=user.get("id")).values(
                     "interest"
                 )
             )
 
             if role == "student":
                 # Get user's recently enrolled courses (up to 4)
-                courses = CourseTracker.objects.filter(
-                    Q(user__username=username) & Q(profile="learner")
-                ).values("course", "created_at")[:4]
+                profile = "learner"
 
             elif role == "teacher":
                 # Get user's recently authored courses (up to 4)
-                courses = CourseTracker.objects.filter(
-                    Q(user__username=username) & Q(profile="author")
-                ).values("course", "created_at")[:4]
+                profile = "author"
+
+            recent_courses = (
+                CourseTracker.objects.filter(
+                    Q(user_id=user.get("id")) & Q(profile=profile)
+                )
+                .order_by("-created_at")
+                .values(
+                    "course",
+                    "created_at",
+                    "course__name",
+                    "course__subcategory",
+                    "course__category",
+                    "course__author_name",
+                )[:4]
+            )
 
-            sorted_courses = sorted(courses, key=lambda x: x["created_at"])
+            # oldest first
+            sorted_courses = reversed(list(recent_courses))
 
             courses_details = []
 
-            userStatus = Status.objects.get(userStatus__username=username).status
-
             for course in sorted_courses:
-                id = course.get("course")
-
-                name = Course.objects.get(id=id).name
-
                 enrolled_date_utc = course.get("created_at")
                 enrolled_date_local = self.convert_to_localtime(enrolled_date_utc)
 
-                subcategory = Course.objects.get(id=id).subcategory
-                category = Course.objects.get(id=id).category
-
-                author = CourseTracker.objects.get(
-                    Q(course__id=id) & Q(profile="author")
-                ).user
-
-                author_full_name = f"{author.first_name} {author.last_name}"
-
                 course_detail = {
-                    "id": id,
-                    "name": name,
-                    "subcategory": subcategory,
-                    "category": category,
-                    "author": author_full_name,
+                    "id": course.get("course"),
+                    "name": course.get("course__name"),
+                    "subcategory": course.get("course__subcategory"),
+                    "category": course.get("course__category"),
+                    "author": course.get("course__author_name"),
                     "enrolled_date": enrolled_date_local,
                 }
 
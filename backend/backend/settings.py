@@ -14,6 +14,7 @@ from pathlib import Path
 from datetime import timedelta
 from dotenv import load_dotenv
 import os
+import tempfile
 
 
 load_dotenv()
@@ -35,7 +36,7 @@ ALLOWED_HOSTS = ["BobbyLRM.pythonanywhere.com"]
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "api.authentication.ClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -49,6 +50,30 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# views using StatelessClaimsJWTAuthentication re-check that a user is active at most
+# once per 60s - a disabled account is rejected within this delay
+STATELESS_AUTH_USER_CACHE_TIMEOUT = 60
+
+# revoked token ids are kept in a per-process Bloom filter, picking up new revocations
+# from other processes every 5s and rebuilt without expired tokens every 10min
+TOKEN_REVOCATION_REFRESH_SECONDS = 5
+TOKEN_REVOCATION_REBUILD_SECONDS = 60 * 10
+TOKEN_REVOCATION_CAPACITY = 10_000
+TOKEN_REVOCATION_ERROR_RATE = 0.001
+
+# bulk user provisioning hashes passwords in one process per CPU (None) and inserts
+# users in transactions of 500
+PROVISIONING_HASH_WORKERS = None
+PROVISIONING_CHUNK_SIZE = 500
+
+# bulk enrollment and blocking accept up to 5000 users per call, enrollments are
+# inserted 500 at a time
+ENROLLMENT_MAX_USERNAMES = 5000
+ENROLLMENT_BATCH_SIZE = 500
+
+# public GET endpoints (eg: course listings) may be cached by browsers and proxies for 5min
+PUBLIC_CACHE_MAX_AGE = 60 * 5
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -163,3 +188,24 @@ CORS_ALLOWS_CREDENTIALS = True
 
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
+
+# course material attachments are streamed to the client 64KB at a time
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# let the web server send attachments: None (Django streams them), "x-accel-redirect"
+# (nginx, internal location DOWNLOAD_OFFLOAD_PREFIX aliasing MEDIA_ROOT) or
+# "x-sendfile" (Apache mod_xsendfile / lighttpd)
+DOWNLOAD_OFFLOAD = os.getenv("DOWNLOAD_OFFLOAD") or None
+DOWNLOAD_OFFLOAD_PREFIX = "/protected/media/"
+
+# signed course material download URLs stay valid (and cacheable) for 5min
+SIGNED_DOWNLOAD_URL_MAX_AGE = 60 * 5
+
+# chunked course material uploads: parts are staged in CHUNKED_UPLOAD_DIR (outside the
+# source tree and MEDIA_ROOT) until the upload is completed, sessions left unfinished
+# are pruned after 1 day
+CHUNKED_UPLOAD_DIR = os.getenv("CHUNKED_UPLOAD_DIR") or os.path.join(
+    tempfile.gettempdir(), "mentis_chunked_uploads"
+)
+CHUNKED_UPLOAD_PART_MAX_SIZE = 100 * 1024 * 1024
+CHUNKED_UPLOAD_SESSION_MAX_AGE = 60 * 60 * 24
@@ -2,8 +2,10 @@
 Setup global urls
 - admin/ -> Admin urls
 - api/user/register/ -> Create new user
+- api/user/register/bulk/ -> Create users from a CSV/JSONL file
 - api/token/ -> Get access token
 - api/token/refresh/ -> Get refresh token
+- api/token/revoke/ -> Revoke access and refresh tokens
 - api/ -> api endpoints
 
 """
@@ -13,16 +15,24 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
-from api.views.views_user import CreateUserView
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from api.views.views_custom_token import MyTokenObtainPairView
+from api.views.views_user import BulkCreateUserView, CreateUserView
+from rest_framework_simplejwt.views import TokenObtainPairView
+from api.views.views_custom_token import (
+    MyTokenObtainPairView,
+    MyTokenRefreshView,
+    TokenRevokeView,
+)
 from django.conf.urls.static import static
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/user/register/", CreateUserView.as_view(), name="register"),
+    path(
+        "api/user/register/bulk/", BulkCreateUserView.as_view(), name="register-bulk"
+    ),
     path("api/token/", MyTokenObtainPairView.as_view(), name="get_token"),
-    path("api/token/refresh/", TokenRefreshView.as_view(), name="refresh"),
+    path("api/token/refresh/", MyTokenRefreshView.as_view(), name="refresh"),
+    path("api/token/revoke/", TokenRevokeView.as_view(), name="revoke"),
     # path("api-auth/", include("rest_framework.urls")),
     path("api/", include("api.urls")),
 ] + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -0,0 +1,55 @@
+"""
+Benchmark course existence check used by ListCourseDetailView
+
+Compares loading every course id into Python against a primary key lookup.
+
+Usage: python -m benchmarks.bench_course_exists [number_of_courses]
+"""
+
+import sys
+from uuid import uuid4
+
+from benchmarks.utils import test_database, timeit
+
+from api.models import Course
+
+
+def seed_courses(count: int) -> list:
+    courses = [
+        Course(
+            name=f"course {i}",
+            category="business",
+            subcategory="sales",
+            description="benchmark course",
+        )
+        for i in range(count)
+    ]
+    Course.objects.bulk_create(courses, batch_size=5000)
+    return [course.id for course in courses]
+
+
+def exists_by_scan(course_id) -> bool:
+    return course_id in list(Course.objects.values_list("id", flat=True))
+
+
+def exists_by_lookup(course_id) -> bool:
+    return Course.objects.filter(id=course_id).values_list("name").first() is not None
+
+
+def main(count: int) -> None:
+    with test_database():
+        course_ids = seed_courses(count)
+        existing_id = course_ids[-1]
+        missing_id = uuid4()
+
+        print(f"courses: {count}")
+        for label, course_id in (("existing", existing_id), ("missing", missing_id)):
+            scan_ms = timeit(lambda: exists_by_scan(course_id), repeat=5)
+            lookup_ms = timeit(lambda: exists_by_lookup(course_id))
+            print(
+                f"{label:>8} id | list + scan: {scan_ms:9.2f} ms | pk lookup: {lookup_ms:6.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
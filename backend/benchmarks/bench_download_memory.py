@@ -0,0 +1,107 @@
+"""
+Benchmark worker memory during parallel course material downloads
+
+Compares reading the whole attachment into an HttpResponse against streaming it with
+`api.downloads.file_response`, while several downloads of the same file run in
+parallel threads. Peak RSS is sampled from /proc (Linux only).
+
+Usage: python -m benchmarks.bench_download_memory [file_size_mb] [parallel_downloads]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import timeit
+
+from django.core.files.storage import FileSystemStorage
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from api.downloads import file_response
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_SIZE / 2**20
+
+
+def read_response(storage, name):
+    with storage.open(name, "rb") as file:
+        return HttpResponse(file.read(), content_type="video/mp4")
+
+
+def stream_response(storage, name):
+    return file_response(RequestFactory().get("/"), name, storage=storage)
+
+
+def consume(response) -> None:
+    # what the WSGI server does: write every chunk to the socket, then close
+    chunks = response.streaming_content if response.streaming else [response.content]
+    for chunk in chunks:
+        pass
+    response.close()
+
+
+def peak_rss_of_parallel_downloads(make_response, storage, name, parallel) -> float:
+    """
+    Return the peak RSS increase (in MB) while `parallel` downloads run
+    """
+    baseline = rss_mb()
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, rss_mb())
+            time.sleep(0.001)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+
+    downloads = [
+        threading.Thread(target=lambda: consume(make_response(storage, name)))
+        for _ in range(parallel)
+    ]
+    for download in downloads:
+        download.start()
+    for download in downloads:
+        download.join()
+
+    done.set()
+    sampler.join()
+    return peak - baseline
+
+
+def main(size_mb: int, parallel: int) -> None:
+    with tempfile.TemporaryDirectory() as media_root:
+        storage = FileSystemStorage(location=media_root)
+        name = "materials/lecture.mp4"
+        os.makedirs(os.path.join(media_root, "materials"))
+        with open(storage.path(name), "wb") as file:
+            for _ in range(size_mb):
+                file.write(os.urandom(2**20))
+
+        print(f"file: {size_mb} MB | parallel downloads: {parallel}")
+        for label, make_response in (
+            ("read + HttpResponse", read_response),
+            ("file_response", stream_response),
+        ):
+            peak = peak_rss_of_parallel_downloads(make_response, storage, name, parallel)
+            elapsed_ms = timeit(lambda: consume(make_response(storage, name)), repeat=3)
+            print(
+                f"{label:>20} | peak RSS increase: {peak:8.1f} MB"
+                f" | single download: {elapsed_ms:8.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+    )
@@ -0,0 +1,62 @@
+"""
+Benchmark the unique email check run by user registration
+
+Compares loading every email into Python against an existence query on the
+LOWER(email) unique index, as the number of registered users grows.
+
+Usage: python -m benchmarks.bench_register_email [number_of_users]
+"""
+
+import sys
+
+from benchmarks.utils import test_database, timeit
+
+from django.contrib.auth.models import User
+from django.db.models.functions import Lower
+
+
+def seed_users(start: int, stop: int) -> None:
+    # passwords are left unusable - hashing is not what is measured here
+    users = [
+        User(username=f"user{i}", email=f"user{i}@example.com", password="!")
+        for i in range(start, stop)
+    ]
+    User.objects.bulk_create(users, batch_size=5000)
+
+
+def email_exists_by_scan(email: str) -> bool:
+    return email in list(User.objects.values_list("email", flat=True))
+
+
+def email_exists_by_lookup(email: str) -> bool:
+    return (
+        User.objects.annotate(email_lower=Lower("email"))
+        .filter(email_lower=email.lower(), email__gt="")
+        .exists()
+    )
+
+
+def main(count: int) -> None:
+    with test_database():
+        seeded = 0
+        size = 1_000
+        while size <= count:
+            seed_users(seeded, size)
+            seeded = size
+
+            existing = f"USER{size - 1}@example.com"
+            missing = "new.user@example.com"
+
+            scan_ms = timeit(lambda: email_exists_by_scan(missing), repeat=3)
+            lookup_ms = timeit(lambda: email_exists_by_lookup(missing))
+            existing_ms = timeit(lambda: email_exists_by_lookup(existing))
+            print(
+                f"users: {size:>9} | list + scan: {scan_ms:9.2f} ms"
+                f" | index lookup (new): {lookup_ms:6.3f} ms"
+                f" | index lookup (taken): {existing_ms:6.3f} ms"
+            )
+            size *= 10
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,44 @@
+"""
+Helpers shared by benchmark scripts
+
+Benchmarks run against a throwaway test database so they never touch db.sqlite3.
+Run them from the `backend/` directory, eg: `python -m benchmarks.bench_course_exists`
+"""
+
+import os
+import time
+from contextlib import contextmanager
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def test_database():
+    """
+    Create a fresh test database for the duration of the benchmark
+    """
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def timeit(func, repeat=20) -> float:
+    """
+    Return the best wall clock time (in ms) of `repeat` calls to `func`
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000